@@ -23,6 +23,9 @@ class TradingConfig(BaseSettings):
     # Database Settings
     database_url: str = Field(default="sqlite:///./earnings_gap_trader.db", env="DATABASE_URL")
     
+    # Cache Settings
+    redis_url: Optional[str] = Field(None, env="REDIS_URL")  # Shared price cache (optional)
+    
     # Zerodha Kite Connect Settings
     kite_api_key: Optional[SecretStr] = Field(None, env="KITE_API_KEY")
     kite_api_secret: Optional[SecretStr] = Field(None, env="KITE_API_SECRET")
@@ -89,6 +92,7 @@ class TradingConfig(BaseSettings):
     
     # API Rate Limiting
     api_rate_limit: int = Field(default=3, gt=0, env="API_RATE_LIMIT")  # requests per second
+    yahoo_rate_limit: int = Field(default=5, gt=0, env="YAHOO_RATE_LIMIT")  # requests per second
     api_timeout: int = Field(default=30, gt=0, env="API_TIMEOUT")
     
     # Performance Settings
@@ -2,13 +2,13 @@
 Comprehensive market data service with Zerodha Kite Connect and Yahoo Finance backup
 """
 import asyncio
+import inspect
 import json
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Callable, Any, Union, Tuple
-from datetime import datetime, timedelta, time as dt_time
+from typing import Dict, List, NamedTuple, Optional, Callable, Any, Union, Tuple
+from datetime import date, datetime, timedelta, time as dt_time
 from enum import Enum
-from dataclasses import dataclass, asdict
 from threading import Thread, Event
 import pandas as pd
 import yfinance as yf
@@ -16,6 +16,14 @@ from kiteconnect import KiteConnect, KiteTicker
 from sqlalchemy.orm import Session
 import numpy as np
 from typing import Set
+from functools import lru_cache
+from uuid import uuid4
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    # Redis is optional, the price cache stays in-process without it
+    aioredis = None
 
 from database import get_db_session
 from models.trade_models import MarketData
@@ -42,9 +50,8 @@ class MarketStatus(Enum):
     HOLIDAY = "holiday"
 
 
-@dataclass
-class TickData:
-    """Real-time tick data structure"""
+class TickData(NamedTuple):
+    """Real-time tick data structure (immutable, tuple-backed to keep per-tick memory low)"""
     symbol: str
     exchange: str
     instrument_token: int
@@ -58,12 +65,11 @@ class TickData:
     timestamp: datetime
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return self._asdict()
 
 
-@dataclass
-class PriceData:
-    """Standardized price data structure"""
+class PriceData(NamedTuple):
+    """Standardized price data structure (immutable, tuple-backed to keep per-quote memory low)"""
     symbol: str
     open: float
     high: float
@@ -79,7 +85,32 @@ class PriceData:
     change_percent: Optional[float] = None
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return self._asdict()
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter for outbound vendor API calls"""
+    
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.rate)
 
 
 class DataSourceInterface(ABC):
@@ -113,9 +144,7 @@ class ZerodhaDataSource(DataSourceInterface):
         self.kite: Optional[KiteConnect] = None
         self.kws: Optional[KiteTicker] = None
         self.connected = False
-        self.last_api_call = 0
-        self.api_call_count = 0
-        self.rate_limit_reset = 0
+        self.rate_limiter = TokenBucket(rate=config.api_rate_limit)
         self.subscribed_tokens: Set[int] = set()
         self.token_symbol_map: Dict[int, str] = {}
         self.symbol_token_map: Dict[str, int] = {}
@@ -248,32 +277,12 @@ class ZerodhaDataSource(DataSourceInterface):
     
     async def _rate_limited_call(self, func, *args, **kwargs):
         """Make rate-limited API calls"""
-        current_time = time.time()
-        
-        # Reset counter every minute
-        if current_time - self.rate_limit_reset > 60:
-            self.api_call_count = 0
-            self.rate_limit_reset = current_time
-        
-        # Check rate limit (3 calls per second, 200 per minute)
-        if self.api_call_count >= 180:  # Conservative limit
-            wait_time = 60 - (current_time - self.rate_limit_reset)
-            if wait_time > 0:
-                logger.warning(f"Rate limit reached, waiting {wait_time:.2f} seconds")
-                await asyncio.sleep(wait_time)
-                self.api_call_count = 0
-                self.rate_limit_reset = time.time()
-        
-        # Ensure minimum 0.33s between calls
-        if current_time - self.last_api_call < 0.33:
-            await asyncio.sleep(0.33 - (current_time - self.last_api_call))
+        # Token bucket keeps concurrent callers under config.api_rate_limit calls per second
+        await self.rate_limiter.acquire()
         
         try:
-            self.api_call_count += 1
-            self.last_api_call = time.time()
-            
             # Run sync function in thread pool
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(None, lambda: func(*args, **kwargs))
             return result
             
@@ -417,6 +426,10 @@ class YahooDataSource(DataSourceInterface):
         self.connected = False
         self.cache: Dict[str, Tuple[PriceData, datetime]] = {}
         self.cache_timeout = 60  # Cache for 1 minute
+        # Ticker objects reused for the trading day (yfinance caches .info per Ticker);
+        # a Ticker is not thread-safe, so each one is paired with a lock held while it is in use
+        self._tickers: Dict[str, Tuple[yf.Ticker, asyncio.Lock, date]] = {}
+        self.rate_limiter = TokenBucket(rate=config.yahoo_rate_limit)
     
     async def connect(self) -> bool:
         """Connect to Yahoo Finance (always available)"""
@@ -424,6 +437,17 @@ class YahooDataSource(DataSourceInterface):
         logger.info("Yahoo Finance data source ready")
         return True
     
+    def _get_ticker(self, symbol: str) -> Tuple[yf.Ticker, asyncio.Lock]:
+        """Get a reusable yfinance Ticker and its lock for a symbol, refreshed once per day"""
+        today = date.today()
+        cached = self._tickers.get(symbol)
+        if cached and cached[2] == today:
+            return cached[0], cached[1]
+        
+        ticker, lock = yf.Ticker(f"{symbol}.NS"), asyncio.Lock()
+        self._tickers[symbol] = (ticker, lock, today)
+        return ticker, lock
+    
     async def get_real_time_price(self, symbol: str) -> Optional[PriceData]:
         """Get price from Yahoo Finance"""
         try:
@@ -434,12 +458,16 @@ class YahooDataSource(DataSourceInterface):
                 if (datetime.now() - cache_time).seconds < self.cache_timeout:
                     return cached_data
             
-            symbol_yf = f"{symbol}.NS"
-            ticker = yf.Ticker(symbol_yf)
+            ticker, ticker_lock = self._get_ticker(symbol)
             
-            # Get current info and recent history
-            info = ticker.info
-            hist = ticker.history(period="1d", interval="1m")
+            # Get current info and recent history; yfinance blocks, so run it in the
+            # thread pool to let requests for different symbols overlap on the wire
+            loop = asyncio.get_running_loop()
+            async with ticker_lock:
+                await self.rate_limiter.acquire()
+                info, hist = await loop.run_in_executor(
+                    None, lambda: (ticker.info, ticker.history(period="1d", interval="1m"))
+                )
             
             if hist.empty:
                 return None
@@ -473,8 +501,7 @@ class YahooDataSource(DataSourceInterface):
     async def get_historical_data(self, symbol: str, from_date: datetime, to_date: datetime, interval: str) -> Optional[pd.DataFrame]:
         """Get historical data from Yahoo Finance"""
         try:
-            symbol_yf = f"{symbol}.NS"
-            ticker = yf.Ticker(symbol_yf)
+            ticker, ticker_lock = self._get_ticker(symbol)
             
             # Convert interval format
             yahoo_interval_map = {
@@ -487,14 +514,26 @@ class YahooDataSource(DataSourceInterface):
             
             yahoo_interval = yahoo_interval_map.get(interval, "1d")
             
-            # Calculate period or use dates
+            # Calculate period or use dates (history() blocks, so it runs in the thread pool)
+            loop = asyncio.get_running_loop()
             if (to_date - from_date).days <= 7 and interval in ["1m", "5m", "15m"]:
                 # For intraday data, use period
-                hist = ticker.history(period="7d", interval=yahoo_interval)
-                hist = hist[hist.index >= from_date]
-                hist = hist[hist.index <= to_date]
+                async with ticker_lock:
+                    await self.rate_limiter.acquire()
+                    hist = await loop.run_in_executor(
+                        None, lambda: ticker.history(period="7d", interval=yahoo_interval)
+                    )
+                # Single label slice on the sorted index instead of two boolean-mask copies
+                start, end = pd.Timestamp(from_date), pd.Timestamp(to_date)
+                if hist.index.tz is not None and start.tzinfo is None:
+                    start, end = start.tz_localize(hist.index.tz), end.tz_localize(hist.index.tz)
+                hist = hist.loc[start:end]
             else:
-                hist = ticker.history(start=from_date, end=to_date, interval=yahoo_interval)
+                async with ticker_lock:
+                    await self.rate_limiter.acquire()
+                    hist = await loop.run_in_executor(
+                        None, lambda: ticker.history(start=from_date, end=to_date, interval=yahoo_interval)
+                    )
             
             if not hist.empty:
                 # Standardize column names to match Zerodha format
@@ -512,6 +551,7 @@ class YahooDataSource(DataSourceInterface):
     
     async def disconnect(self) -> None:
         self.connected = False
+        self._tickers.clear()
 
 
 class DataValidator:
@@ -551,29 +591,52 @@ class DataValidator:
         
         return len(issues) == 0, issues
     
+    def validate_price_frame(self, df: pd.DataFrame) -> Tuple[pd.Series, pd.DataFrame]:
+        """Validate OHLCV rows in a single vectorized pass
+        
+        Applies the validate_price_data rules to every row, with Close as the last price.
+        Returns a boolean mask of valid rows and a frame flagging which rule each row failed.
+        """
+        high = df['High'].to_numpy()
+        low = df['Low'].to_numpy()
+        close = df['Close'].to_numpy()
+        
+        issues = pd.DataFrame({
+            "non_positive_close": close <= 0,
+            "high_below_low": high < low,
+            "close_outside_range": ~((low <= close) & (close <= high)),
+        }, index=df.index)
+        
+        if 'Volume' in df.columns:
+            issues["negative_volume"] = df['Volume'].to_numpy() < 0
+        
+        return ~issues.any(axis=1), issues
+    
     def clean_historical_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean and validate historical data"""
         if df is None or df.empty:
             return df
         
-        # Remove rows with missing critical data
-        df = df.dropna(subset=['Open', 'High', 'Low', 'Close'])
+        # Build a single row mask instead of filtering (and copying) the frame per rule
+        ohlc = df[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=float)
         
-        # Remove rows where high < low
-        df = df[df['High'] >= df['Low']]
+        # Remove rows with missing, zero or negative prices (NaN compares False)
+        keep = (ohlc > 0).all(axis=1)
         
-        # Remove rows with zero or negative prices
-        for col in ['Open', 'High', 'Low', 'Close']:
-            df = df[df[col] > 0]
+        # Remove rows where high < low
+        keep &= ohlc[:, 1] >= ohlc[:, 2]
         
         # Remove volume outliers
         if 'Volume' in df.columns:
-            volume_median = df['Volume'].median()
+            volume = df['Volume'].to_numpy(dtype=float)
+            volume_median = df['Volume'][keep].median()
             volume_threshold = volume_median * 20  # 20x median volume
-            df = df[df['Volume'] <= volume_threshold]
+            keep &= volume <= volume_threshold
+        
+        df = df[keep]
         
         # Forward fill small gaps (max 3 consecutive)
-        df = df.fillna(method='ffill', limit=3)
+        df = df.ffill(limit=3)
         
         return df
     
@@ -584,30 +647,53 @@ class DataValidator:
         if df is None or len(df) < 2:
             return actions
         
-        # Calculate day-to-day returns
-        df['return'] = df['Close'].pct_change()
+        # Calculate day-to-day returns (without mutating the caller's frame)
+        returns = df['Close'].pct_change().to_numpy()
         
-        # Detect large gaps (potential splits/bonuses)
-        large_gaps = df[abs(df['return']) > 0.15]  # 15% threshold
-        
-        for idx, row in large_gaps.iterrows():
-            action_type = "split" if row['return'] < -0.15 else "bonus"
+        # Detect large gaps (potential splits/bonuses) - only the hits are visited in Python
+        for i in np.flatnonzero(np.abs(returns) > 0.15):  # 15% threshold
+            gap_return = float(returns[i])
             actions.append({
-                "date": idx,
-                "type": action_type,
-                "return": row['return'],
-                "severity": "high" if abs(row['return']) > 0.3 else "medium"
+                "date": df.index[i],
+                "type": "split" if gap_return < -0.15 else "bonus",
+                "return": gap_return,
+                "severity": "high" if abs(gap_return) > 0.3 else "medium"
             })
         
         return actions
 
 
+# Columnar layout of one buffered tick (see TickDataProcessor)
+TICK_DTYPE = np.dtype([
+    ('timestamp', 'datetime64[us]'),
+    ('last_price', 'f8'),
+    ('average_price', 'f8'),
+    ('volume', 'i8'),
+    ('last_quantity', 'i8'),
+    ('buy_quantity', 'i8'),
+    ('sell_quantity', 'i8'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+])
+
+# OHLC columns in TICK_DTYPE; a key missing from the tick is stored as NaN
+_OHLC_KEYS = ('open', 'high', 'low', 'close')
+
+
 class TickDataProcessor:
-    """Process and manage real-time tick data"""
+    """Process and manage real-time tick data
+    
+    Ticks are buffered per symbol in a fixed-size NumPy ring buffer (TICK_DTYPE) so
+    writes never reallocate and rolling aggregations run as vectorized array ops.
+    """
     
     def __init__(self, db_session: Session):
         self.db = db_session
-        self.tick_buffer: Dict[str, List[TickData]] = {}
+        self.tick_buffer: Dict[str, np.ndarray] = {}
+        self.tick_counts: Dict[str, int] = {}  # Total ticks seen per symbol
+        self.tick_meta: Dict[str, Tuple[str, int]] = {}  # (exchange, instrument_token) per symbol
         self.last_prices: Dict[str, float] = {}
         self.callbacks: List[Callable] = []
         self.buffer_size = 100  # Keep last 100 ticks per symbol
@@ -617,21 +703,35 @@ class TickDataProcessor:
         try:
             symbol = tick_data.symbol
             
-            # Update buffer
-            if symbol not in self.tick_buffer:
-                self.tick_buffer[symbol] = []
-            
-            self.tick_buffer[symbol].append(tick_data)
-            
-            # Maintain buffer size
-            if len(self.tick_buffer[symbol]) > self.buffer_size:
-                self.tick_buffer[symbol] = self.tick_buffer[symbol][-self.buffer_size:]
+            # Update ring buffer in place
+            buffer = self.tick_buffer.get(symbol)
+            if buffer is None:
+                buffer = self.tick_buffer[symbol] = np.zeros(self.buffer_size, dtype=TICK_DTYPE)
+            self.tick_meta[symbol] = (tick_data.exchange, tick_data.instrument_token)
+            
+            count = self.tick_counts.get(symbol, 0)
+            ohlc = tick_data.ohlc
+            buffer[count % self.buffer_size] = (
+                tick_data.timestamp,
+                tick_data.last_price,
+                tick_data.average_price,
+                tick_data.volume,
+                tick_data.last_quantity,
+                tick_data.buy_quantity,
+                tick_data.sell_quantity,
+                ohlc.get('open', np.nan),
+                ohlc.get('high', np.nan),
+                ohlc.get('low', np.nan),
+                ohlc.get('close', np.nan),
+            )
+            count += 1
+            self.tick_counts[symbol] = count
             
             # Update last price
             self.last_prices[symbol] = tick_data.last_price
             
             # Store to database (sample every 10th tick to avoid overload)
-            if len(self.tick_buffer[symbol]) % 10 == 0:
+            if count % 10 == 0:
                 await self._store_tick_to_db(tick_data)
             
             # Notify callbacks
@@ -668,9 +768,46 @@ class TickDataProcessor:
     
     def get_latest_ticks(self, symbol: str, count: int = 10) -> List[TickData]:
         """Get latest ticks for a symbol"""
-        if symbol in self.tick_buffer:
-            return self.tick_buffer[symbol][-count:]
-        return []
+        window = self.get_latest_ticks_array(symbol, count)
+        if not len(window):
+            return []
+        
+        exchange, instrument_token = self.tick_meta[symbol]
+        return [
+            TickData(
+                symbol=symbol,
+                exchange=exchange,
+                instrument_token=instrument_token,
+                last_price=float(row['last_price']),
+                last_quantity=int(row['last_quantity']),
+                average_price=float(row['average_price']),
+                volume=int(row['volume']),
+                buy_quantity=int(row['buy_quantity']),
+                sell_quantity=int(row['sell_quantity']),
+                ohlc={key: float(row[key]) for key in _OHLC_KEYS if not np.isnan(row[key])},
+                timestamp=row['timestamp'].item(),
+            )
+            for row in window
+        ]
+    
+    def get_latest_ticks_array(self, symbol: str, count: int = 10) -> np.ndarray:
+        """Get latest ticks for a symbol as a TICK_DTYPE array, oldest first
+        
+        A window that does not wrap the ring is a view on the live buffer and is
+        overwritten by later ticks; a wrapped window is a copy.
+        """
+        buffer = self.tick_buffer.get(symbol)
+        if buffer is None:
+            return np.empty(0, dtype=TICK_DTYPE)
+        
+        total = self.tick_counts[symbol]
+        count = min(count, total, self.buffer_size)
+        end = total % self.buffer_size or self.buffer_size
+        
+        # Contiguous slice is a view; a wrapped window is concatenated into a copy
+        if count <= end:
+            return buffer[end - count:end]
+        return np.concatenate((buffer[self.buffer_size - (count - end):], buffer[:end]))
     
     def get_last_price(self, symbol: str) -> Optional[float]:
         """Get last known price for a symbol"""
@@ -705,14 +842,27 @@ class MarketHoursManager:
             datetime(2024, 11, 1),  # Diwali
             datetime(2024, 12, 25), # Christmas
         ]
+        self._holiday_dates = frozenset(h.date() for h in self.holidays_2024)
+        
+        # Status only changes on whole minutes, so it is cached per minute
+        self._status_for_minute = lru_cache(maxsize=64)(self._compute_market_status)
     
     def get_market_status(self, timestamp: Optional[datetime] = None) -> MarketStatus:
         """Get current market status"""
         if timestamp is None:
             timestamp = datetime.now()
         
+        minute = timestamp.replace(second=0, microsecond=0)
+        return self._status_for_minute(minute, timestamp == minute)
+    
+    def _compute_market_status(self, minute: datetime, on_minute_boundary: bool) -> MarketStatus:
+        """Compute market status for a minute (exact boundary or anywhere inside it)"""
+        # Close/post-market comparisons are inclusive, so hh:mm:00 and the rest
+        # of the minute can differ; represent the latter by the first microsecond
+        timestamp = minute if on_minute_boundary else minute + timedelta(microseconds=1)
+        
         # Check if it's a holiday
-        if timestamp.date() in [h.date() for h in self.holidays_2024]:
+        if timestamp.date() in self._holiday_dates:
             return MarketStatus.HOLIDAY
         
         # Check if it's a weekend
@@ -760,7 +910,7 @@ class MarketHoursManager:
         
         # Skip weekends and holidays
         while (next_open.weekday() >= 5 or 
-               next_open.date() in [h.date() for h in self.holidays_2024]):
+               next_open.date() in self._holiday_dates):
             next_open += timedelta(days=1)
         
         return next_open
@@ -780,51 +930,264 @@ class MarketHoursManager:
         }
 
 
+# Index constituents are fixed at import time; tuples are shared, never copied per call
+NIFTY_50_SYMBOLS: Tuple[str, ...] = (
+    "RELIANCE", "TCS", "HDFCBANK", "INFY", "HINDUNILVR",
+    "ICICIBANK", "SBIN", "BHARTIARTL", "ITC", "ASIANPAINT",
+    "LT", "AXISBANK", "MARUTI", "KOTAKBANK", "HCLTECH",
+    "WIPRO", "ULTRACEMCO", "ONGC", "TECHM", "TITAN",
+    "SUNPHARMA", "POWERGRID", "NESTLEIND", "TATAMOTORS", "TATASTEEL",
+    "BAJFINANCE", "M&M", "NTPC", "JSWSTEEL", "DRREDDY",
+    "EICHERMOT", "ADANIPORTS", "HEROMOTOCO", "CIPLA", "COALINDIA",
+    "GRASIM", "BRITANNIA", "BPCL", "HINDALCO", "DIVISLAB",
+    "SHREECEM", "BAJAJFINSV", "INDUSINDBK", "UPL", "APOLLOHOSP",
+    "TATACONSUM", "BAJAJ-AUTO", "HDFCLIFE", "SBILIFE", "ADANIENT"
+)
+
+NIFTY_NEXT_50_SYMBOLS: Tuple[str, ...] = (
+    "ADANIGREEN", "ADANITRANS", "AMBUJACEM", "BANDHANBNK", "BERGEPAINT",
+    "BIOCON", "BOSCHLTD", "CANFINHOME", "CHOLAFIN", "COLPAL",
+    "CONCOR", "COFORGE", "DABUR", "DALBHARAT", "DELTACORP",
+    "DMART", "ESCORTS", "GODREJCP", "GODREJPROP", "GRANULES",
+    "HAVELLS", "ICICIPRULI", "IDFCFIRSTB", "INDIGO", "INDUSTOWER",
+    "JINDALSTEL", "JUBLFOOD", "LALPATHLAB", "LICHSGFIN", "LUPIN",
+    "MARICO", "MCDOWELL-N", "MFSL", "MOTHERSON", "MPHASIS",
+    "MRF", "NAUKRI", "NMDC", "PAGEIND", "PEL",
+    "PIDILITIND", "PIIND", "PNB", "SAIL", "SIEMENS",
+    "TORNTPHARM", "TORNTPOWER", "TRENT", "VOLTAS", "ZEEL"
+)
+
+NIFTY_100_SYMBOLS: Tuple[str, ...] = NIFTY_50_SYMBOLS + NIFTY_NEXT_50_SYMBOLS
+_MAJOR_STOCKS = frozenset(NIFTY_100_SYMBOLS)
+
+
 class StockListManager:
     """Manage stock lists (Nifty 50, etc.)"""
     
     def __init__(self):
-        self.nifty_50_symbols = [
-            "RELIANCE", "TCS", "HDFCBANK", "INFY", "HINDUNILVR",
-            "ICICIBANK", "SBIN", "BHARTIARTL", "ITC", "ASIANPAINT",
-            "LT", "AXISBANK", "MARUTI", "KOTAKBANK", "HCLTECH",
-            "WIPRO", "ULTRACEMCO", "ONGC", "TECHM", "TITAN",
-            "SUNPHARMA", "POWERGRID", "NESTLEIND", "TATAMOTORS", "TATASTEEL",
-            "BAJFINANCE", "M&M", "NTPC", "JSWSTEEL", "DRREDDY",
-            "EICHERMOT", "ADANIPORTS", "HEROMOTOCO", "CIPLA", "COALINDIA",
-            "GRASIM", "BRITANNIA", "BPCL", "HINDALCO", "DIVISLAB",
-            "SHREECEM", "BAJAJFINSV", "INDUSINDBK", "UPL", "APOLLOHOSP",
-            "TATACONSUM", "BAJAJ-AUTO", "HDFCLIFE", "SBILIFE", "ADANIENT"
-        ]
-        
-        self.nifty_next_50_symbols = [
-            "ADANIGREEN", "ADANITRANS", "AMBUJACEM", "BANDHANBNK", "BERGEPAINT",
-            "BIOCON", "BOSCHLTD", "CANFINHOME", "CHOLAFIN", "COLPAL",
-            "CONCOR", "COFORGE", "DABUR", "DALBHARAT", "DELTACORP",
-            "DMART", "ESCORTS", "GODREJCP", "GODREJPROP", "GRANULES",
-            "HAVELLS", "ICICIPRULI", "IDFCFIRSTB", "INDIGO", "INDUSTOWER",
-            "JINDALSTEL", "JUBLFOOD", "LALPATHLAB", "LICHSGFIN", "LUPIN",
-            "MARICO", "MCDOWELL-N", "MFSL", "MOTHERSON", "MPHASIS",
-            "MRF", "NAUKRI", "NMDC", "PAGEIND", "PEL",
-            "PIDILITIND", "PIIND", "PNB", "SAIL", "SIEMENS",
-            "TORNTPHARM", "TORNTPOWER", "TRENT", "VOLTAS", "ZEEL"
-        ]
+        self.nifty_50_symbols = NIFTY_50_SYMBOLS
+        self.nifty_next_50_symbols = NIFTY_NEXT_50_SYMBOLS
     
-    def get_nifty_50(self) -> List[str]:
+    def get_nifty_50(self) -> Tuple[str, ...]:
         """Get Nifty 50 stock symbols"""
-        return self.nifty_50_symbols.copy()
+        return self.nifty_50_symbols
     
-    def get_nifty_next_50(self) -> List[str]:
+    def get_nifty_next_50(self) -> Tuple[str, ...]:
         """Get Nifty Next 50 stock symbols"""
-        return self.nifty_next_50_symbols.copy()
+        return self.nifty_next_50_symbols
     
-    def get_all_major_stocks(self) -> List[str]:
+    def get_all_major_stocks(self) -> Tuple[str, ...]:
         """Get all major stocks (Nifty 100)"""
-        return self.nifty_50_symbols + self.nifty_next_50_symbols
+        return NIFTY_100_SYMBOLS
     
     def is_major_stock(self, symbol: str) -> bool:
         """Check if symbol is a major stock"""
-        return symbol in self.get_all_major_stocks()
+        return symbol in _MAJOR_STOCKS
+
+
+def _json_default(value: Any) -> Any:
+    """Convert NumPy scalars from pandas rows to the matching Python type"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class SharedPriceCache:
+    """Price cache shared across worker processes through Redis
+    
+    Every process keeps a local copy of the quotes it has seen so hot reads stay
+    in-process. When Redis is configured it holds the shared copy under
+    shared:market:{exchange}:{symbol}:ticker, and a pub/sub channel tells the other
+    workers to drop their local entry whenever a quote is refreshed. Pub/sub is
+    fire-and-forget, so every write also bumps a per-symbol version in Redis; local
+    entries older than that version are re-read from Redis. Without Redis it behaves
+    like a plain in-process dict.
+    """
+    
+    KEY_PREFIX = "shared:market"
+    INVALIDATE_CHANNEL = "shared:market:invalidate"
+    VERSION_KEY = "shared:market:version"
+    VERSION_POLL_INTERVAL = 0.1  # seconds between version checks
+    
+    def __init__(self, redis_url: Optional[str] = None, exchange: str = "NSE", default_ttl: int = 30):
+        self.exchange = exchange
+        self.default_ttl = default_ttl
+        self._local: Dict[str, Tuple[PriceData, datetime]] = {}
+        self._local_versions: Dict[str, int] = {}
+        self._versions: Dict[str, int] = {}
+        self._versions_checked_at = 0.0
+        self._redis = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self._instance_id = uuid4().hex
+        
+        if redis_url:
+            if aioredis is None:
+                logger.warning("REDIS_URL is set but redis is not installed, using in-process price cache")
+            else:
+                self._redis = aioredis.from_url(redis_url)
+    
+    def __len__(self) -> int:
+        return len(self._local)
+    
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._local
+    
+    @property
+    def is_shared(self) -> bool:
+        return self._redis is not None
+    
+    def _key(self, symbol: str) -> str:
+        return f"{self.KEY_PREFIX}:{self.exchange}:{symbol}:ticker"
+    
+    @staticmethod
+    def _serialize(price_data: PriceData, cached_at: datetime) -> str:
+        payload = price_data.to_dict()
+        payload["timestamp"] = price_data.timestamp.isoformat()
+        # NumPy scalars keep their kind (int64 volume stays an int)
+        return json.dumps({"price": payload, "cached_at": cached_at.isoformat()}, default=_json_default)
+    
+    @staticmethod
+    def _deserialize(raw: Union[str, bytes]) -> Tuple[PriceData, datetime]:
+        data = json.loads(raw)
+        payload = data["price"]
+        payload["timestamp"] = datetime.fromisoformat(payload["timestamp"])
+        return PriceData(**payload), datetime.fromisoformat(data["cached_at"])
+    
+    async def start(self) -> None:
+        """Start listening for invalidations published by other workers"""
+        if self._redis is None or self._listener_task is not None:
+            return
+        self._listener_task = asyncio.create_task(self._listen_for_invalidations())
+    
+    async def _listen_for_invalidations(self) -> None:
+        pubsub = self._redis.pubsub()
+        try:
+            await pubsub.subscribe(self.INVALIDATE_CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                data = message["data"]
+                if isinstance(data, bytes):
+                    data = data.decode()
+                origin, _, symbol = data.partition(":")
+                if origin != self._instance_id:
+                    self._local.pop(symbol, None)
+                    self._local_versions.pop(symbol, None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Price cache invalidation listener stopped: {e}")
+        finally:
+            await pubsub.aclose()
+    
+    async def _refresh_versions(self) -> None:
+        """Re-read the shared version table, at most once per poll interval"""
+        now = time.monotonic()
+        if now - self._versions_checked_at < self.VERSION_POLL_INTERVAL:
+            return
+        self._versions_checked_at = now
+        
+        try:
+            versions = await self._redis.hgetall(self.VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Shared price cache version check failed: {e}")
+            return
+        
+        self._versions = {
+            (key.decode() if isinstance(key, bytes) else key): int(value)
+            for key, value in versions.items()
+        }
+    
+    async def get(self, symbol: str) -> Optional[Tuple[PriceData, datetime]]:
+        """Get (price_data, cached_at) for a symbol, falling back to the shared copy"""
+        entry = self._local.get(symbol)
+        if self._redis is None:
+            return entry
+        
+        if entry is not None:
+            await self._refresh_versions()
+            if self._local_versions.get(symbol, 0) >= self._versions.get(symbol, 0):
+                return entry
+        
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.get(self._key(symbol))
+                pipe.hget(self.VERSION_KEY, symbol)
+                raw, version = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Shared price cache read failed for {symbol}: {e}")
+            return entry
+        
+        if raw is None:
+            self._local.pop(symbol, None)
+            self._local_versions.pop(symbol, None)
+            return None
+        
+        entry = self._deserialize(raw)
+        self._local[symbol] = entry
+        self._local_versions[symbol] = int(version or 0)
+        return entry
+    
+    async def set(self, symbol: str, price_data: PriceData, ttl: Optional[int] = None) -> None:
+        """Cache a quote locally and publish it to the other workers"""
+        cached_at = datetime.now()
+        self._local[symbol] = (price_data, cached_at)
+        
+        if self._redis is None:
+            return
+        
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.set(self._key(symbol), self._serialize(price_data, cached_at), ex=ttl or self.default_ttl)
+                pipe.hincrby(self.VERSION_KEY, symbol, 1)
+                pipe.publish(self.INVALIDATE_CHANNEL, f"{self._instance_id}:{symbol}")
+                _, version, _ = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Shared price cache write failed for {symbol}: {e}")
+            return
+        
+        self._local_versions[symbol] = version
+        self._versions[symbol] = max(version, self._versions.get(symbol, 0))
+    
+    async def load_many(self, symbols: List[str]) -> List[str]:
+        """Pull quotes other workers already cached in one MGET; returns the symbols loaded"""
+        if self._redis is None or not symbols:
+            return []
+        
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.mget([self._key(symbol) for symbol in symbols])
+                pipe.hmget(self.VERSION_KEY, symbols)
+                values, versions = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Shared price cache bulk read failed: {e}")
+            return []
+        
+        loaded = []
+        for symbol, raw, version in zip(symbols, values, versions):
+            if raw is not None:
+                self._local[symbol] = self._deserialize(raw)
+                self._local_versions[symbol] = int(version or 0)
+                loaded.append(symbol)
+        return loaded
+    
+    def clear(self) -> None:
+        """Drop the local copies (the shared copy expires on its own TTL)"""
+        self._local.clear()
+        self._local_versions.clear()
+    
+    async def close(self) -> None:
+        """Stop the invalidation listener and close the Redis connection"""
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        
+        if self._redis is not None:
+            await self._redis.aclose()
 
 
 class MarketDataManager:
@@ -841,12 +1204,21 @@ class MarketDataManager:
         self.primary_source: DataSourceInterface = self.zerodha_source
         self.backup_source: DataSourceInterface = self.yahoo_source
         
-        self.price_cache: Dict[str, Tuple[PriceData, datetime]] = {}
         self.cache_timeout = 30  # 30 seconds cache
+        self.price_cache = SharedPriceCache(
+            redis_url=getattr(config, 'redis_url', None),
+            default_ttl=self.cache_timeout
+        )
         
         self.subscribers: Dict[str, List[Callable]] = {}
         self.is_streaming = False
         self._streaming_task: Optional[asyncio.Task] = None
+        
+        # Price updates are queued and fanned out by a dispatcher task so slow
+        # subscriber callbacks never block the price/tick path
+        self.update_queue_size = 10000
+        self._update_queue: Optional[asyncio.Queue] = None
+        self._dispatcher_task: Optional[asyncio.Task] = None
     
     async def initialize(self) -> bool:
         """Initialize market data manager"""
@@ -872,6 +1244,9 @@ class MarketDataManager:
             if isinstance(self.primary_source, ZerodhaDataSource):
                 self.primary_source.tick_callbacks.append(self.tick_processor.process_tick)
             
+            # Listen for quotes refreshed by other workers
+            await self.price_cache.start()
+            
             logger.info("Market data manager initialized successfully")
             return True
             
@@ -883,9 +1258,18 @@ class MarketDataManager:
         """Get real-time price with automatic failover"""
         try:
             # Check cache first
-            if use_cache and symbol in self.price_cache:
-                cached_data, cache_time = self.price_cache[symbol]
-                if (datetime.now() - cache_time).seconds < self.cache_timeout:
+            cached = await self.price_cache.get(symbol) if use_cache else None
+            if cached:
+                cached_data, cache_time = cached
+                now = datetime.now()
+                if (now - cache_time).total_seconds() < self.cache_timeout:
+                    return cached_data
+                
+                # Prices don't move while the market is closed, so a quote captured
+                # after the last session stays valid until the next market open
+                if (not self.market_hours.is_market_open(now) and
+                        not self.market_hours.is_market_open(cache_time) and
+                        self.market_hours.get_next_market_open(cache_time) > now):
                     return cached_data
             
             # Try primary source first
@@ -911,7 +1295,7 @@ class MarketDataManager:
             
             # Cache valid data
             if price_data:
-                self.price_cache[symbol] = (price_data, datetime.now())
+                await self.price_cache.set(symbol, price_data, ttl=self._shared_cache_ttl())
                 
                 # Notify subscribers
                 await self._notify_subscribers(symbol, price_data)
@@ -922,6 +1306,15 @@ class MarketDataManager:
             logger.error(f"Error getting real-time price for {symbol}: {e}")
             return None
     
+    def _shared_cache_ttl(self) -> int:
+        """Seconds to keep a quote in the shared cache (until the next open when closed)"""
+        now = datetime.now()
+        if self.market_hours.is_market_open(now):
+            return self.cache_timeout
+        
+        until_open = (self.market_hours.get_next_market_open(now) - now).total_seconds()
+        return max(self.cache_timeout, int(until_open))
+    
     async def get_historical_data(
         self, 
         symbol: str, 
@@ -937,6 +1330,7 @@ class MarketDataManager:
             # Clean and validate data
             if data is not None and not data.empty:
                 data = self.data_validator.clean_historical_data(data)
+                self._log_history_issues(symbol, data)
                 
                 # Detect corporate actions
                 corporate_actions = self.data_validator.detect_corporate_actions(data)
@@ -950,6 +1344,7 @@ class MarketDataManager:
                 
                 if data is not None and not data.empty:
                     data = self.data_validator.clean_historical_data(data)
+                    self._log_history_issues(symbol, data)
             
             return data
             
@@ -957,6 +1352,16 @@ class MarketDataManager:
             logger.error(f"Error getting historical data for {symbol}: {e}")
             return None
     
+    def _log_history_issues(self, symbol: str, data: pd.DataFrame) -> None:
+        """Report rows that still fail price validation after cleaning"""
+        if data.empty:
+            return
+        
+        valid_rows, issues = self.data_validator.validate_price_frame(data)
+        if not valid_rows.all():
+            counts = {rule: int(count) for rule, count in issues.sum().items() if count}
+            logger.warning(f"Data quality issues in {int((~valid_rows).sum())} historical rows for {symbol}: {counts}")
+    
     async def subscribe_to_price_updates(self, symbol: str, callback: Callable) -> bool:
         """Subscribe to real-time price updates"""
         try:
@@ -964,6 +1369,7 @@ class MarketDataManager:
                 self.subscribers[symbol] = []
             
             self.subscribers[symbol].append(callback)
+            self._ensure_dispatcher()
             
             # If using Zerodha, subscribe to ticks
             if isinstance(self.primary_source, ZerodhaDataSource):
@@ -995,14 +1401,63 @@ class MarketDataManager:
             logger.error(f"Error unsubscribing from price updates for {symbol}: {e}")
             return False
     
+    def _ensure_dispatcher(self) -> None:
+        """Create the update queue and start the dispatcher task if needed"""
+        # Created lazily so the queue binds to the running event loop
+        if self._update_queue is None:
+            self._update_queue = asyncio.Queue(maxsize=self.update_queue_size)
+        
+        if self._dispatcher_task is None or self._dispatcher_task.done():
+            self._dispatcher_task = asyncio.create_task(self._dispatch_updates())
+    
     async def _notify_subscribers(self, symbol: str, price_data: PriceData) -> None:
-        """Notify all subscribers of price updates"""
-        if symbol in self.subscribers:
-            for callback in self.subscribers[symbol]:
+        """Queue a price update for subscribers of the symbol"""
+        if symbol not in self.subscribers:
+            return
+        
+        self._ensure_dispatcher()
+        try:
+            self._update_queue.put_nowait((symbol, price_data))
+        except asyncio.QueueFull:
+            # Drop the oldest update rather than stall the producer
+            self._update_queue.get_nowait()
+            self._update_queue.put_nowait((symbol, price_data))
+            logger.warning("Price update queue full, dropped oldest update")
+    
+    async def _dispatch_updates(self) -> None:
+        """Drain queued price updates and fan them out to subscriber callbacks"""
+        while True:
+            batch = [await self._update_queue.get()]
+            while not self._update_queue.empty():
+                batch.append(self._update_queue.get_nowait())
+            
+            for symbol, price_data in batch:
                 try:
-                    await callback(price_data)
+                    await self._fan_out_update(symbol, price_data)
                 except Exception as e:
-                    logger.error(f"Error in price update callback for {symbol}: {e}")
+                    logger.error(f"Error dispatching price update for {symbol}: {e}")
+    
+    async def _fan_out_update(self, symbol: str, price_data: PriceData) -> None:
+        """Run every subscriber callback for one update, awaiting the async ones together"""
+        pending = []
+        for callback in list(self.subscribers.get(symbol, ())):
+            try:
+                result = callback(price_data)
+            except Exception as e:
+                logger.error(f"Error in price update callback for {symbol}: {e}")
+                continue
+            
+            # Sync callbacks have already run; only awaitables are gathered
+            if inspect.isawaitable(result):
+                pending.append(result)
+        
+        if not pending:
+            return
+        
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error in price update callback for {symbol}: {result}")
     
     async def start_price_streaming(self, update_interval: int = 5) -> None:
         """Start price streaming for all subscribed symbols"""
@@ -1078,21 +1533,45 @@ class MarketDataManager:
             for symbol, result in zip(symbols, results)
         }
     
-    async def warmup_cache(self, symbols: Optional[List[str]] = None) -> None:
-        """Warm up cache with commonly used symbols"""
+    async def warmup_cache(self, symbols: Optional[List[str]] = None) -> int:
+        """Warm up cache with commonly used symbols, returns how many were cached"""
         if symbols is None:
             symbols = self.stock_list.get_nifty_50()[:20]  # Top 20 Nifty stocks
         
         logger.info(f"Warming up cache for {len(symbols)} symbols")
-        await self.get_multiple_prices(symbols)
+        
+        # Pick up quotes other workers already fetched in one round trip;
+        # only the missing or stale ones go out to the data sources
+        await self.price_cache.load_many(symbols)
+        
+        # All fetches run concurrently; gather(return_exceptions=True) awaits every task,
+        # so one failing symbol neither cancels the others nor leaves tasks behind
+        prices = await self.get_multiple_prices(symbols)
+        warmed = sum(1 for price in prices.values() if price is not None)
+        
+        if warmed < len(symbols):
+            failed = [symbol for symbol, price in prices.items() if price is None]
+            logger.warning(f"Cache warmup missed {len(failed)} symbols: {failed}")
+        
+        return warmed
     
     async def cleanup(self) -> None:
         """Cleanup resources"""
         try:
             await self.stop_price_streaming()
+            
+            if self._dispatcher_task:
+                self._dispatcher_task.cancel()
+                try:
+                    await self._dispatcher_task
+                except asyncio.CancelledError:
+                    pass
+                self._dispatcher_task = None
+            
             await self.primary_source.disconnect()
             if self.backup_source:
                 await self.backup_source.disconnect()
+            await self.price_cache.close()
             
             logger.info("Market data manager cleaned up")
             
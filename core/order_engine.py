@@ -10,6 +10,7 @@ from datetime import datetime, timedelta, time as dt_time
 from dataclasses import dataclass, asdict
 from enum import Enum
 import pandas as pd
+import numpy as np
 import logging
 from kiteconnect import KiteConnect
 from kiteconnect.exceptions import NetworkException, TokenException, OrderException
@@ -25,6 +26,10 @@ from config import get_config
 logger = get_logger(__name__)
 config = get_config()
 
+# Fill quality bands: absolute slippage % up to each threshold (inclusive)
+FILL_QUALITY_THRESHOLDS = np.array([0.05, 0.1, 0.2, 0.5])
+FILL_QUALITY_LABELS = np.array(['EXCELLENT', 'GOOD', 'FAIR', 'POOR', 'VERY_POOR'])
+
 
 class OrderType(Enum):
     """Order type classifications"""
@@ -611,6 +616,16 @@ class ExecutionAnalyzer:
         slippage_percent = (slippage / expected_price) * 100
         return slippage, slippage_percent
     
+    def calculate_slippage_batch(self, expected_prices: np.ndarray, actual_prices: np.ndarray,
+                                 is_buy: Union[bool, np.ndarray] = True) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized calculate_slippage over arrays of fills"""
+        expected = np.asarray(expected_prices, dtype=np.float64)
+        actual = np.asarray(actual_prices, dtype=np.float64)
+        
+        slippage = np.where(is_buy, actual - expected, expected - actual)  # Positive = worse fill
+        slippage_percent = (slippage / expected) * 100
+        return slippage, slippage_percent
+    
     def assess_fill_quality(self, slippage_percent: float) -> str:
         """Assess the quality of order fill based on slippage"""
         abs_slippage = abs(slippage_percent)
@@ -626,6 +641,11 @@ class ExecutionAnalyzer:
         else:
             return "VERY_POOR"
     
+    def assess_fill_quality_vec(self, slippage_percents: np.ndarray) -> np.ndarray:
+        """Vectorized assess_fill_quality returning an array of quality labels"""
+        abs_slippage = np.abs(np.asarray(slippage_percents, dtype=np.float64))
+        return FILL_QUALITY_LABELS[np.digitize(abs_slippage, FILL_QUALITY_THRESHOLDS, right=True)]
+    
     def record_execution(self, symbol: str, signal_time: datetime,
                         execution_time: datetime, entry_price: float,
                         expected_price: float, commission: float = 0.0):
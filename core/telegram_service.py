@@ -2,12 +2,14 @@
 Comprehensive Telegram bot for trade notifications, manual approval, and system control
 """
 import asyncio
-import json
+import heapq
 import time
 from typing import Dict, List, Optional, Tuple, Any, Callable
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
+from functools import lru_cache, partial
+from operator import attrgetter
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.constants import ParseMode
@@ -54,6 +56,12 @@ class NotificationType(Enum):
     ERROR = "error"
 
 
+# Enum values listed once at import; identifier-like literals are already interned
+TRADING_MODE_VALUES = tuple(mode.value for mode in TradingMode)
+APPROVAL_STATUS_VALUES = tuple(status.value for status in ApprovalStatus)
+NOTIFICATION_TYPE_VALUES = tuple(kind.value for kind in NotificationType)
+
+
 @dataclass
 class PendingSignal:
     """Pending signal awaiting approval"""
@@ -69,7 +77,7 @@ class PendingSignal:
     modified_params: Optional[Dict] = None
 
 
-@dataclass
+@dataclass(frozen=True)
 class TelegramConfig:
     """Telegram bot configuration"""
     bot_token: str
@@ -77,10 +85,24 @@ class TelegramConfig:
     webhook_url: Optional[str] = None
     approval_timeout: int = 300  # 5 minutes
     max_retries: int = 3
-    rate_limit_delay: float = 1.0
+    rate_limit_delay: float = 1.0  # Minimum spacing between messages to the same chat
+    max_messages_per_second: int = 30  # Bot-wide limit across all chats (Telegram's per-bot cap)
 
 
-@dataclass
+@dataclass(frozen=True)
+class SystemStatus:
+    """Snapshot of system state for status messages"""
+    mode: TradingMode
+    emergency_stop: bool
+    active_trades: int
+    daily_pnl: float
+    daily_trades: Optional[int] = None
+    success_rate: Optional[float] = None
+    best_performer: Optional[str] = None
+    worst_performer: Optional[str] = None
+
+
+@dataclass(frozen=True)
 class NotificationMessage:
     """Notification message structure"""
     type: NotificationType
@@ -92,69 +114,106 @@ class NotificationMessage:
     disable_web_page_preview: bool = True
 
 
+# Emoji set for all bot messages (exposed as MessageFormatter.EMOJIS)
+_EMOJIS = {
+    'signal': '🎯',
+    'profit': '💰',
+    'loss': '📉',
+    'warning': '⚠️',
+    'error': '❌',
+    'success': '✅',
+    'info': 'ℹ️',
+    'chart_up': '📈',
+    'chart_down': '📉',
+    'money': '💵',
+    'clock': '⏰',
+    'fire': '🔥',
+    'rocket': '🚀',
+    'stop': '🛑',
+    'pause': '⏸️',
+    'play': '▶️',
+    'gear': '⚙️',
+    'shield': '🛡️',
+    'bell': '🔔',
+    'eyes': '👀',
+    'thumbs_up': '👍',
+    'thumbs_down': '👎'
+}
+
+# Glyphs used on every signal/P&L message, bound once as module globals
+_SIGNAL_EMOJI = _EMOJIS['signal']
+_PROFIT_EMOJI = _EMOJIS['profit']
+_LOSS_EMOJI = _EMOJIS['loss']
+
+
 class MessageFormatter:
     """Professional message formatting with emojis"""
     
-    EMOJIS = {
-        'signal': '🎯',
-        'profit': '💰',
-        'loss': '📉',
-        'warning': '⚠️',
-        'error': '❌',
-        'success': '✅',
-        'info': 'ℹ️',
-        'chart_up': '📈',
-        'chart_down': '📉',
-        'money': '💵',
-        'clock': '⏰',
-        'fire': '🔥',
-        'rocket': '🚀',
-        'stop': '🛑',
-        'pause': '⏸️',
-        'play': '▶️',
-        'gear': '⚙️',
-        'shield': '🛡️',
-        'bell': '🔔',
-        'eyes': '👀',
-        'thumbs_up': '👍',
-        'thumbs_down': '👎'
+    EMOJIS = _EMOJIS
+    
+    _MODE_EMOJIS = {
+        TradingMode.AUTO: EMOJIS['play'],
+        TradingMode.MANUAL: EMOJIS['eyes'],
+        TradingMode.PAUSED: EMOJIS['pause']
     }
     
+    # Signal fields read by the alert template, in _render_signal_alert's order
+    _signal_alert_key = attrgetter(
+        'symbol', 'company_name', 'signal_type', 'confidence', 'confidence_score',
+        'entry_price', 'stop_loss', 'profit_target', 'risk_reward_ratio',
+        'gap_percent', 'gap_amount', 'previous_close', 'volume_ratio', 'current_volume',
+        'actual_eps', 'expected_eps', 'earnings_surprise', 'entry_time', 'signal_explanation'
+    )
+    
     @classmethod
     def format_signal_alert(cls, signal: EarningsGapSignal) -> str:
         """Format earnings gap signal alert"""
-        direction = "UP" if signal.signal_type.value.endswith('_up') else "DOWN"
-        direction_emoji = cls.EMOJIS['chart_up'] if direction == "UP" else cls.EMOJIS['chart_down']
+        # Signals are not mutated once emitted, so re-sends and retries reuse the cached text
+        return cls._render_signal_alert(cls._signal_alert_key(signal))
+    
+    @classmethod
+    @lru_cache(maxsize=512)
+    def _render_signal_alert(cls, key: Tuple) -> str:
+        """Render a signal alert from the field values picked by _signal_alert_key"""
+        (symbol, company_name, signal_type, confidence, confidence_score,
+         entry_price, stop_loss, profit_target, risk_reward_ratio,
+         gap_percent, gap_amount, previous_close, volume_ratio, current_volume,
+         actual_eps, expected_eps, earnings_surprise, entry_time, signal_explanation) = key
         
-        confidence_emoji = cls.EMOJIS['fire'] if signal.confidence_score >= 80 else cls.EMOJIS['signal']
+        # The f-string compiles to a single BUILD_STRING; bind the emoji table once for it
+        emojis = cls.EMOJIS
+        direction = "UP" if signal_type.value.endswith('_up') else "DOWN"
+        direction_emoji = emojis['chart_up'] if direction == "UP" else emojis['chart_down']
+        
+        confidence_emoji = emojis['fire'] if confidence_score >= 80 else _SIGNAL_EMOJI
         
         return f"""
-{cls.EMOJIS['signal']} <b>EARNINGS GAP SIGNAL</b> {confidence_emoji}
+{_SIGNAL_EMOJI} <b>EARNINGS GAP SIGNAL</b> {confidence_emoji}
 
-<b>{signal.company_name} ({signal.symbol})</b>
+<b>{company_name} ({symbol})</b>
 {direction_emoji} <b>Direction:</b> GAP {direction}
-{cls.EMOJIS['rocket']} <b>Confidence:</b> {signal.confidence.value.title()} ({signal.confidence_score:.0f}%)
+{emojis['rocket']} <b>Confidence:</b> {confidence.value.title()} ({confidence_score:.0f}%)
 
-{cls.EMOJIS['money']} <b>Trading Details:</b>
-• Entry Price: ₹{signal.entry_price:.2f}
-• Stop Loss: ₹{signal.stop_loss:.2f}
-• Profit Target: ₹{signal.profit_target:.2f}
-• Risk/Reward: 1:{signal.risk_reward_ratio:.2f}
+{emojis['money']} <b>Trading Details:</b>
+• Entry Price: ₹{entry_price:.2f}
+• Stop Loss: ₹{stop_loss:.2f}
+• Profit Target: ₹{profit_target:.2f}
+• Risk/Reward: 1:{risk_reward_ratio:.2f}
 
-{cls.EMOJIS['chart_up']} <b>Market Data:</b>
-• Gap: {signal.gap_percent:+.1f}% (₹{signal.gap_amount:+.2f})
-• Previous Close: ₹{signal.previous_close:.2f}
-• Volume Surge: {signal.volume_ratio:.1f}x ({signal.current_volume:,})
+{emojis['chart_up']} <b>Market Data:</b>
+• Gap: {gap_percent:+.1f}% (₹{gap_amount:+.2f})
+• Previous Close: ₹{previous_close:.2f}
+• Volume Surge: {volume_ratio:.1f}x ({current_volume:,})
 
-{cls.EMOJIS['info']} <b>Earnings:</b>
-• Actual EPS: ₹{signal.actual_eps}
-• Expected EPS: ₹{signal.expected_eps}
-• Surprise: {signal.earnings_surprise:+.1f}%
+{emojis['info']} <b>Earnings:</b>
+• Actual EPS: ₹{actual_eps}
+• Expected EPS: ₹{expected_eps}
+• Surprise: {earnings_surprise:+.1f}%
 
-{cls.EMOJIS['clock']} <b>Signal Time:</b> {signal.entry_time.strftime('%H:%M:%S')}
+{emojis['clock']} <b>Signal Time:</b> {entry_time.strftime('%H:%M:%S')}
 
-{cls.EMOJIS['eyes']} <b>Analysis:</b>
-{signal.signal_explanation}
+{emojis['eyes']} <b>Analysis:</b>
+{signal_explanation}
         """.strip()
     
     @classmethod
@@ -181,7 +240,7 @@ class MessageFormatter:
     def format_trade_exit(cls, symbol: str, exit_type: str, pnl: float, 
                          pnl_percent: float, exit_price: float) -> str:
         """Format trade exit notification"""
-        pnl_emoji = cls.EMOJIS['profit'] if pnl > 0 else cls.EMOJIS['loss']
+        pnl_emoji = _PROFIT_EMOJI if pnl > 0 else _LOSS_EMOJI
         exit_emoji = cls.EMOJIS['success'] if pnl > 0 else cls.EMOJIS['warning']
         
         return f"""
@@ -201,7 +260,7 @@ class MessageFormatter:
     def format_pnl_summary(cls, daily_pnl: float, total_trades: int, 
                           win_rate: float, active_positions: int) -> str:
         """Format daily P&L summary"""
-        pnl_emoji = cls.EMOJIS['profit'] if daily_pnl > 0 else cls.EMOJIS['loss']
+        pnl_emoji = _PROFIT_EMOJI if daily_pnl > 0 else _LOSS_EMOJI
         
         return f"""
 {cls.EMOJIS['chart_up']} <b>DAILY P&L SUMMARY</b> {pnl_emoji}
@@ -216,24 +275,29 @@ class MessageFormatter:
         """.strip()
     
     @classmethod
-    def format_system_status(cls, mode: TradingMode, emergency_stop: bool,
-                           active_trades: int, daily_pnl: float) -> str:
+    def format_system_status(cls, status: SystemStatus) -> str:
         """Format system status message"""
-        mode_emoji = {
-            TradingMode.AUTO: cls.EMOJIS['play'],
-            TradingMode.MANUAL: cls.EMOJIS['eyes'],
-            TradingMode.PAUSED: cls.EMOJIS['pause']
-        }
-        
+        emergency_stop = status.emergency_stop
         status_emoji = cls.EMOJIS['stop'] if emergency_stop else cls.EMOJIS['success']
         
+        # Optional performance lines, shown only when the caller supplied them
+        performance = ""
+        if status.daily_trades is not None:
+            performance += f"\n• Trades Today: {status.daily_trades}"
+        if status.success_rate is not None:
+            performance += f"\n• Success Rate: {status.success_rate:.1f}%"
+        if status.best_performer:
+            performance += f"\n• Best: {status.best_performer}"
+        if status.worst_performer:
+            performance += f"\n• Worst: {status.worst_performer}"
+        
         return f"""
 {cls.EMOJIS['gear']} <b>SYSTEM STATUS</b> {status_emoji}
 
-{mode_emoji[mode]} <b>Trading Mode:</b> {mode.value.upper()}
+{cls._MODE_EMOJIS[status.mode]} <b>Trading Mode:</b> {status.mode.value.upper()}
 {cls.EMOJIS['shield']} <b>Emergency Stop:</b> {'ACTIVE' if emergency_stop else 'INACTIVE'}
-{cls.EMOJIS['chart_up']} <b>Active Trades:</b> {active_trades}
-{cls.EMOJIS['money']} <b>Today's P&L:</b> ₹{daily_pnl:+,.0f}
+{cls.EMOJIS['chart_up']} <b>Active Trades:</b> {status.active_trades}
+{cls.EMOJIS['money']} <b>Today's P&L:</b> ₹{status.daily_pnl:+,.0f}{performance}
 
 {cls.EMOJIS['clock']} <b>Status Time:</b> {datetime.now().strftime('%H:%M:%S')}
         """.strip()
@@ -242,9 +306,21 @@ class MessageFormatter:
 class SignalNotifier:
     """Interactive signal approval system"""
     
+    # Approval keyboard layout as (label, callback action) rows; only the signal ID varies
+    _APPROVAL_BUTTONS = (
+        (("✅ Approve", "approve"), ("❌ Reject", "reject")),
+        (("⚙️ Modify", "modify"), ("ℹ️ Details", "details")),
+    )
+    
     def __init__(self, bot: 'TelegramBot'):
         self.bot = bot
         self.pending_signals: Dict[str, PendingSignal] = {}
+        # Min-heap of (expires_at, signal_id); entries for already handled signals are skipped
+        # when the sweeper pops them at their deadline, so it only spans one approval window
+        self._expiry_heap: List[Tuple[datetime, str]] = []
+        self._expiry_task: Optional[asyncio.Task] = None
+        # Strong references to in-flight message edits so they aren't garbage collected
+        self._update_tasks: set = set()
         
     async def send_signal_alert(self, signal: EarningsGapSignal) -> Optional[str]:
         """Send signal alert with approval buttons"""
@@ -255,50 +331,50 @@ class SignalNotifier:
             message_text = MessageFormatter.format_signal_alert(signal)
             
             # Create inline keyboard
-            keyboard = [
-                [
-                    InlineKeyboardButton("✅ Approve", callback_data=f"approve_{signal_id}"),
-                    InlineKeyboardButton("❌ Reject", callback_data=f"reject_{signal_id}")
-                ],
-                [
-                    InlineKeyboardButton("⚙️ Modify", callback_data=f"modify_{signal_id}"),
-                    InlineKeyboardButton("ℹ️ Details", callback_data=f"details_{signal_id}")
-                ]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            # Send to all authorized chats
-            message_ids = []
-            for chat_id in self.bot.config.chat_ids:
-                try:
-                    message = await self.bot.application.bot.send_message(
-                        chat_id=chat_id,
-                        text=message_text,
+            reply_markup = self._create_approval_keyboard(signal_id)
+            
+            # Send to all authorized chats concurrently; a failed chat doesn't stop the others
+            chat_ids = self.bot.config.chat_ids
+            results = await asyncio.gather(
+                *(
+                    self.bot.send_message(
+                        chat_id,
+                        message_text,
                         reply_markup=reply_markup,
                         parse_mode=ParseMode.HTML,
                         disable_web_page_preview=True
                     )
-                    message_ids.append(message.message_id)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to send signal to chat {chat_id}: {e}")
+                    for chat_id in chat_ids
+                ),
+                return_exceptions=True
+            )
+            
+            message_ids = []
+            for chat_id, result in zip(chat_ids, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to send signal to chat {chat_id}: {result}")
+                else:
+                    message_ids.append(result.message_id)
             
             if message_ids:
                 # Store pending signal
+                created_at = datetime.now()
                 pending_signal = PendingSignal(
                     signal_id=signal_id,
                     signal=signal,
                     message_id=message_ids[0],  # Primary message ID
                     chat_id=self.bot.config.chat_ids[0],  # Primary chat
-                    created_at=datetime.now(),
-                    expires_at=datetime.now() + timedelta(seconds=self.bot.config.approval_timeout),
+                    created_at=created_at,
+                    expires_at=created_at + timedelta(seconds=self.bot.config.approval_timeout),
                     status=ApprovalStatus.PENDING
                 )
                 
                 self.pending_signals[signal_id] = pending_signal
+                heapq.heappush(self._expiry_heap, (pending_signal.expires_at, signal_id))
                 
-                # Schedule expiry check
-                asyncio.create_task(self._check_signal_expiry(signal_id))
+                # One sweeper task handles expiry for all pending signals
+                if self._expiry_task is None or self._expiry_task.done():
+                    self._expiry_task = asyncio.create_task(self._expiry_sweeper())
                 
                 logger.info(f"Signal alert sent: {signal_id} for {signal.symbol}")
                 return signal_id
@@ -309,6 +385,13 @@ class SignalNotifier:
             logger.error(f"Error sending signal alert: {e}")
             return None
     
+    def _create_approval_keyboard(self, signal_id: str) -> InlineKeyboardMarkup:
+        """Build the approval keyboard for a signal"""
+        return InlineKeyboardMarkup([
+            [InlineKeyboardButton(label, callback_data=f"{action}_{signal_id}") for label, action in row]
+            for row in self._APPROVAL_BUTTONS
+        ])
+    
     async def handle_approval(self, signal_id: str, approved: bool, 
                             user_id: int, username: str = None) -> bool:
         """Handle signal approval/rejection"""
@@ -371,29 +454,54 @@ class SignalNotifier:
             logger.error(f"Error executing approved signal: {e}")
             return False
     
-    async def _check_signal_expiry(self, signal_id: str):
-        """Check and handle signal expiry"""
+    async def _expiry_sweeper(self):
+        """Expire pending signals as their deadlines pass; exits once the heap is drained"""
         try:
-            await asyncio.sleep(self.bot.config.approval_timeout)
-            
-            if signal_id in self.pending_signals:
-                pending_signal = self.pending_signals[signal_id]
+            while self._expiry_heap:
+                delay = (self._expiry_heap[0][0] - datetime.now()).total_seconds()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self.cleanup_expired_signals()
                 
-                if pending_signal.status == ApprovalStatus.PENDING:
-                    pending_signal.status = ApprovalStatus.EXPIRED
-                    
-                    # Update message
-                    expiry_text = f"⏰ Signal EXPIRED for {pending_signal.signal.symbol} (no approval within 5 minutes)"
-                    await self._update_signal_message(pending_signal, expiry_text)
-                    
-                    # Remove from pending
-                    del self.pending_signals[signal_id]
-                    
-                    logger.info(f"Signal {signal_id} expired")
-                    
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error(f"Error checking signal expiry: {e}")
     
+    def stop_expiry_sweeper(self):
+        """Cancel the expiry sweeper (pending signals stay as they are)"""
+        if self._expiry_task is not None and not self._expiry_task.done():
+            self._expiry_task.cancel()
+        self._expiry_task = None
+    
+    def cleanup_expired_signals(self, now: Optional[datetime] = None) -> int:
+        """Expire pending signals past their deadline and return how many were expired"""
+        # One clock read for the whole sweep; callers on a tick loop can pass theirs in
+        now = now or datetime.now()
+        expired_count = 0
+        
+        # Only the expired prefix of the heap is visited, not every pending signal
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, signal_id = heapq.heappop(self._expiry_heap)
+            pending_signal = self.pending_signals.get(signal_id)
+            
+            if pending_signal is None or pending_signal.status != ApprovalStatus.PENDING:
+                continue
+            
+            pending_signal.status = ApprovalStatus.EXPIRED
+            del self.pending_signals[signal_id]
+            expired_count += 1
+            
+            expiry_text = f"⏰ Signal EXPIRED for {pending_signal.signal.symbol} (no approval within 5 minutes)"
+            update_task = asyncio.create_task(self._update_signal_message(pending_signal, expiry_text))
+            self._update_tasks.add(update_task)
+            update_task.add_done_callback(self._update_tasks.discard)
+        
+        if expired_count:
+            logger.info(f"Expired {expired_count} pending signal(s)")
+        
+        return expired_count
+    
     async def _update_signal_message(self, pending_signal: PendingSignal, status_text: str):
         """Update signal message with status"""
         try:
@@ -502,26 +610,39 @@ class TradeNotifier:
             logger.error(f"Error sending risk alert: {e}")
     
     async def _send_notification(self, notification: NotificationMessage):
-        """Send notification to all authorized chats"""
-        for chat_id in notification.chat_ids:
+        """Send notification to all authorized chats concurrently"""
+        await asyncio.gather(
+            *(self._send_to_chat(chat_id, notification) for chat_id in notification.chat_ids)
+        )
+    
+    async def _send_to_chat(self, chat_id: int, notification: NotificationMessage):
+        """Send notification to a single chat (paced per chat by TelegramBot.send_message)"""
+        send = partial(
+            self.bot.send_message,
+            chat_id,
+            notification.content,
+            parse_mode=notification.parse_mode,
+            reply_markup=notification.reply_markup,
+            disable_web_page_preview=notification.disable_web_page_preview
+        )
+        
+        try:
+            await send()
+            
+        except RetryAfter as e:
+            retry_after = e.retry_after
+            if isinstance(retry_after, timedelta):
+                retry_after = retry_after.total_seconds()
+            logger.warning(f"Rate limited, retrying chat {chat_id} in {retry_after} seconds")
+            await asyncio.sleep(retry_after)
+            
             try:
-                await self.bot.application.bot.send_message(
-                    chat_id=chat_id,
-                    text=notification.content,
-                    parse_mode=notification.parse_mode,
-                    reply_markup=notification.reply_markup,
-                    disable_web_page_preview=notification.disable_web_page_preview
-                )
-                
-                # Rate limiting
-                await asyncio.sleep(self.bot.config.rate_limit_delay)
-                
-            except RetryAfter as e:
-                logger.warning(f"Rate limited, waiting {e.retry_after} seconds")
-                await asyncio.sleep(e.retry_after)
-                
-            except Exception as e:
-                logger.error(f"Failed to send notification to chat {chat_id}: {e}")
+                await send()
+            except Exception as retry_error:
+                logger.error(f"Failed to send notification to chat {chat_id} after retry: {retry_error}")
+            
+        except Exception as e:
+            logger.error(f"Failed to send notification to chat {chat_id}: {e}")
 
 
 class CommandHandler:
@@ -540,12 +661,12 @@ class CommandHandler:
             # Get system status
             status = await self.bot.order_engine.get_execution_status()
             
-            message_text = MessageFormatter.format_system_status(
+            message_text = MessageFormatter.format_system_status(SystemStatus(
                 mode=self.bot.trading_mode,
                 emergency_stop=status['emergency_stop'],
                 active_trades=status['active_trades'],
                 daily_pnl=self.app_state.performance_metrics.get("total_pnl", 0.0)
-            )
+            ))
             
             await update.message.reply_text(message_text, parse_mode=ParseMode.HTML)
             
@@ -670,7 +791,7 @@ class CommandHandler:
     
     def _is_authorized(self, chat_id: int) -> bool:
         """Check if chat ID is authorized"""
-        return chat_id in self.bot.config.chat_ids
+        return self.bot._is_authorized_chat(chat_id)
 
 
 class CallbackHandler:
@@ -770,8 +891,13 @@ class CallbackHandler:
         config = get_config()
         if not config.telegram_chat_id:
             return False
-        authorized_ids = [int(chat_id.strip()) for chat_id in config.telegram_chat_id.split(',')]
-        return user_id in authorized_ids
+        return user_id in _parse_chat_ids(config.telegram_chat_id)
+
+
+@lru_cache(maxsize=8)
+def _parse_chat_ids(raw_chat_ids: str) -> frozenset:
+    """Parse a comma separated chat ID setting (cached per setting value)"""
+    return frozenset(int(chat_id.strip()) for chat_id in raw_chat_ids.split(','))
 
 
 class TelegramBot:
@@ -784,8 +910,15 @@ class TelegramBot:
         self.risk_manager = risk_manager
         self.trading_mode = TradingMode.AUTO
         
-        # Initialize application with conflict resolution
-        self.application = Application.builder().token(config.bot_token).use_signal_handlers(False).build()
+        # Initialize application with conflict resolution. Sends share one keep-alive
+        # HTTP client (pooled connections); polling keeps its own get_updates pool
+        self.application = (
+            Application.builder()
+            .token(config.bot_token)
+            .connection_pool_size(20)
+            .use_signal_handlers(False)
+            .build()
+        )
         
         # Clear any existing webhook to avoid conflicts
         self._clear_webhook_on_startup = True
@@ -801,6 +934,53 @@ class TelegramBot:
         
         # Bot state
         self.is_running = False
+        
+        # Checked on every inbound command, so keep it a set rather than the config list
+        self._authorized = frozenset(config.chat_ids)
+        
+        # Bot-wide send limit: token bucket allowing bursts of max_messages_per_second,
+        # refilled at the same rate per second
+        self._rate_capacity = float(self.config.max_messages_per_second)
+        self._refill_rate = float(self.config.max_messages_per_second)
+        self._tokens = self._rate_capacity
+        self._last_refill = time.monotonic()
+        
+        # Per-chat pacing: earliest monotonic time the next message to each chat may go out
+        self._chat_next_send: Dict[int, float] = {}
+    
+    def _is_authorized_chat(self, chat_id: int) -> bool:
+        """Check if chat ID is one of the configured chats"""
+        return chat_id in self._authorized
+    
+    def _is_rate_limited(self) -> bool:
+        """Refill the send bucket and report whether it is out of tokens"""
+        now = time.monotonic()
+        self._tokens = min(
+            self._rate_capacity, self._tokens + (now - self._last_refill) * self._refill_rate
+        )
+        self._last_refill = now
+        return self._tokens < 1
+    
+    def _update_rate_limiter(self):
+        """Consume one send token"""
+        self._tokens -= 1
+    
+    async def send_message(self, chat_id: int, text: str, **kwargs):
+        """Send a message once the per-chat spacing and bot-wide send limit allow it"""
+        # Both limits are checked and claimed without an await in between, so concurrent
+        # sends can't share a chat slot or the last token
+        while True:
+            wait = self._chat_next_send.get(chat_id, 0.0) - time.monotonic()
+            if wait <= 0:
+                if not self._is_rate_limited():
+                    break
+                wait = (1 - self._tokens) / self._refill_rate
+            await asyncio.sleep(wait)
+        
+        self._update_rate_limiter()
+        self._chat_next_send[chat_id] = time.monotonic() + self.config.rate_limit_delay
+        
+        return await self.application.bot.send_message(chat_id=chat_id, text=text, **kwargs)
     
     def _setup_handlers(self):
         """Setup bot command and callback handlers"""
@@ -932,6 +1112,8 @@ Welcome to the automated earnings gap trading system!
     async def stop(self):
         """Stop the Telegram bot"""
         try:
+            self.signal_notifier.stop_expiry_sweeper()
+            
             if self.application.updater.running:
                 await self.application.updater.stop()
             
@@ -0,0 +1,39 @@
+"""
+Shared pytest configuration for the test suite
+"""
+import os
+
+import pytest
+
+# config validates credentials when it is first imported, which happens while test
+# modules are collected; placeholders let the suite run without a real environment
+for _name, _value in {
+    "SECRET_KEY": "test-secret-key",
+    "KITE_API_KEY": "test-kite-api-key",
+    "KITE_API_SECRET": "test-kite-api-secret",
+    "TELEGRAM_BOT_TOKEN": "test-telegram-bot-token",
+    "TELEGRAM_CHAT_ID": "0",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runbench", action="store_true", default=False,
+        help="Run tests marked as perf (requires pytest-benchmark)"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: performance benchmark, skipped unless --runbench is given")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip perf tests unless explicitly requested"""
+    if config.getoption("--runbench"):
+        return
+    
+    skip_perf = pytest.mark.skip(reason="perf test, run with --runbench")
+    for item in items:
+        if item.get_closest_marker("perf"):
+            item.add_marker(skip_perf)
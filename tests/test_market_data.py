@@ -10,10 +10,18 @@ from datetime import datetime, timedelta
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+
+def flush_output(out: list) -> None:
+    """Write buffered report lines to stdout in a single call"""
+    if out:
+        sys.stdout.write('\n'.join(out) + '\n')
+        out.clear()
+
 async def test_market_data_service():
     """Test the market data service comprehensively"""
-    print("🚀 Testing Market Data Service")
-    print("=" * 50)
+    out: list = []
+    out.append("🚀 Testing Market Data Service")
+    out.append("=" * 50)
     
     try:
         from core.market_data import (
@@ -24,7 +32,8 @@ async def test_market_data_service():
         from database import get_db_session
         
         # Initialize components
-        print("\n1. 🔧 Testing Component Initialization")
+        flush_output(out)
+        out.append("\n1. 🔧 Testing Component Initialization")
         market_data_manager = MarketDataManager()
         zerodha_source = ZerodhaDataSource()
         yahoo_source = YahooDataSource()
@@ -33,33 +42,36 @@ async def test_market_data_service():
         stock_list = StockListManager()
         tick_processor = TickDataProcessor(get_db_session())
         
-        print("✅ All components initialized successfully")
+        out.append("✅ All components initialized successfully")
         
         # Test market hours
-        print("\n2. 🕐 Testing Market Hours Manager")
+        flush_output(out)
+        out.append("\n2. 🕐 Testing Market Hours Manager")
         market_status = market_hours.get_market_status()
         is_open = market_hours.is_market_open()
         next_open = market_hours.get_next_market_open()
         market_hours_today = market_hours.get_market_hours_today()
         
-        print(f"✅ Market Status: {market_status.value}")
-        print(f"✅ Market Open: {is_open}")
-        print(f"✅ Next Market Open: {next_open}")
-        print(f"✅ Today's Hours: {market_hours_today}")
+        out.append(f"✅ Market Status: {market_status.value}")
+        out.append(f"✅ Market Open: {is_open}")
+        out.append(f"✅ Next Market Open: {next_open}")
+        out.append(f"✅ Today's Hours: {market_hours_today}")
         
         # Test stock list manager
-        print("\n3. 📊 Testing Stock List Manager")
+        flush_output(out)
+        out.append("\n3. 📊 Testing Stock List Manager")
         nifty_50 = stock_list.get_nifty_50()
         nifty_next_50 = stock_list.get_nifty_next_50()
         all_major = stock_list.get_all_major_stocks()
         
-        print(f"✅ Nifty 50 stocks: {len(nifty_50)}")
-        print(f"✅ Nifty Next 50 stocks: {len(nifty_next_50)}")
-        print(f"✅ All major stocks: {len(all_major)}")
-        print(f"✅ Sample stocks: {nifty_50[:5]}")
+        out.append(f"✅ Nifty 50 stocks: {len(nifty_50)}")
+        out.append(f"✅ Nifty Next 50 stocks: {len(nifty_next_50)}")
+        out.append(f"✅ All major stocks: {len(all_major)}")
+        out.append(f"✅ Sample stocks: {nifty_50[:5]}")
         
         # Test data validator
-        print("\n4. ✅ Testing Data Validator")
+        flush_output(out)
+        out.append("\n4. ✅ Testing Data Validator")
         test_price_data = PriceData(
             symbol="RELIANCE",
             open=2450.0,
@@ -73,105 +85,115 @@ async def test_market_data_service():
         )
         
         is_valid, issues = data_validator.validate_price_data(test_price_data)
-        print(f"✅ Price data validation: {is_valid}")
+        out.append(f"✅ Price data validation: {is_valid}")
         if issues:
-            print(f"   Issues: {issues}")
+            out.append(f"   Issues: {issues}")
         
         # Test Yahoo Finance source
-        print("\n5. 🌐 Testing Yahoo Finance Data Source")
+        flush_output(out)
+        out.append("\n5. 🌐 Testing Yahoo Finance Data Source")
         yahoo_connected = await yahoo_source.connect()
-        print(f"✅ Yahoo Finance connected: {yahoo_connected}")
+        out.append(f"✅ Yahoo Finance connected: {yahoo_connected}")
         
         if yahoo_connected:
             test_symbol = "RELIANCE"
-            print(f"   Getting real-time price for {test_symbol}...")
+            out.append(f"   Getting real-time price for {test_symbol}...")
             
             yahoo_price = await yahoo_source.get_real_time_price(test_symbol)
             if yahoo_price:
-                print(f"✅ Yahoo price data retrieved:")
-                print(f"   Symbol: {yahoo_price.symbol}")
-                print(f"   Last Price: ₹{yahoo_price.last_price:.2f}")
-                print(f"   Volume: {yahoo_price.volume:,}")
-                print(f"   Source: {yahoo_price.source}")
-                print(f"   Timestamp: {yahoo_price.timestamp}")
+                out.append(f"✅ Yahoo price data retrieved:")
+                out.append(f"   Symbol: {yahoo_price.symbol}")
+                out.append(f"   Last Price: ₹{yahoo_price.last_price:.2f}")
+                out.append(f"   Volume: {yahoo_price.volume:,}")
+                out.append(f"   Source: {yahoo_price.source}")
+                out.append(f"   Timestamp: {yahoo_price.timestamp}")
             else:
-                print("⚠️  No price data received from Yahoo Finance")
+                out.append("⚠️  No price data received from Yahoo Finance")
             
             # Test historical data
-            print(f"\n   Getting historical data for {test_symbol}...")
+            out.append(f"\n   Getting historical data for {test_symbol}...")
             from_date = datetime.now() - timedelta(days=30)
             to_date = datetime.now()
             
             yahoo_hist = await yahoo_source.get_historical_data(test_symbol, from_date, to_date, "1d")
             if yahoo_hist is not None and not yahoo_hist.empty:
-                print(f"✅ Yahoo historical data retrieved:")
-                print(f"   Rows: {len(yahoo_hist)}")
-                print(f"   Columns: {list(yahoo_hist.columns)}")
-                print(f"   Date range: {yahoo_hist.index[0]} to {yahoo_hist.index[-1]}")
-                print(f"   Sample data:\n{yahoo_hist.head(2)}")
+                out.append(f"✅ Yahoo historical data retrieved:")
+                out.append(f"   Rows: {len(yahoo_hist)}")
+                out.append(f"   Columns: {list(yahoo_hist.columns)}")
+                out.append(f"   Date range: {yahoo_hist.index[0]} to {yahoo_hist.index[-1]}")
+                out.append(f"   Sample data:\n{yahoo_hist.head(2)}")
             else:
-                print("⚠️  No historical data received from Yahoo Finance")
+                out.append("⚠️  No historical data received from Yahoo Finance")
         
         # Test Zerodha source (will likely fail without credentials)
-        print("\n6. 🔑 Testing Zerodha Data Source")
+        flush_output(out)
+        out.append("\n6. 🔑 Testing Zerodha Data Source")
         zerodha_connected = await zerodha_source.connect()
-        print(f"✅ Zerodha connected: {zerodha_connected}")
+        out.append(f"✅ Zerodha connected: {zerodha_connected}")
         
         if not zerodha_connected:
-            print("   ℹ️  Zerodha connection failed (expected without API credentials)")
+            out.append("   ℹ️  Zerodha connection failed (expected without API credentials)")
         else:
-            print("   🎉 Zerodha connection successful!")
+            out.append("   🎉 Zerodha connection successful!")
             
             test_symbol = "RELIANCE"
             zerodha_price = await zerodha_source.get_real_time_price(test_symbol)
             if zerodha_price:
-                print(f"✅ Zerodha price data retrieved:")
-                print(f"   Symbol: {zerodha_price.symbol}")
-                print(f"   Last Price: ₹{zerodha_price.last_price:.2f}")
-                print(f"   Bid: ₹{zerodha_price.bid}")
-                print(f"   Ask: ₹{zerodha_price.ask}")
+                out.append(f"✅ Zerodha price data retrieved:")
+                out.append(f"   Symbol: {zerodha_price.symbol}")
+                out.append(f"   Last Price: ₹{zerodha_price.last_price:.2f}")
+                out.append(f"   Bid: ₹{zerodha_price.bid}")
+                out.append(f"   Ask: ₹{zerodha_price.ask}")
             else:
-                print("⚠️  No price data received from Zerodha")
+                out.append("⚠️  No price data received from Zerodha")
         
         # Test Market Data Manager
-        print("\n7. 🎛️  Testing Market Data Manager")
+        flush_output(out)
+        out.append("\n7. 🎛️  Testing Market Data Manager")
         manager_initialized = await market_data_manager.initialize()
-        print(f"✅ Market Data Manager initialized: {manager_initialized}")
+        out.append(f"✅ Market Data Manager initialized: {manager_initialized}")
         
         if manager_initialized:
             # Test getting market status
             market_status_dict = await market_data_manager.get_market_status()
-            print(f"✅ Market Status from Manager:")
+            out.append(f"✅ Market Status from Manager:")
             for key, value in market_status_dict.items():
-                print(f"   {key}: {value}")
+                out.append(f"   {key}: {value}")
             
             # Test getting real-time price
             test_symbols = ["RELIANCE", "TCS", "INFY"]
-            print(f"\n   Testing real-time prices for {test_symbols}...")
+            out.append(f"\n   Testing real-time prices for {test_symbols}...")
             
-            for symbol in test_symbols:
-                price_data = await market_data_manager.get_real_time_price(symbol)
+            fetch_semaphore = asyncio.Semaphore(8)
+
+            async def fetch_price(symbol):
+                async with fetch_semaphore:
+                    return symbol, await market_data_manager.get_real_time_price(symbol)
+
+            price_results = await asyncio.gather(*(fetch_price(symbol) for symbol in test_symbols))
+
+            for symbol, price_data in price_results:
                 if price_data:
-                    print(f"✅ {symbol}: ₹{price_data.last_price:.2f} "
+                    out.append(f"✅ {symbol}: ₹{price_data.last_price:.2f} "
                           f"({price_data.change:+.2f}, {price_data.change_percent:+.2%}) "
                           f"[{price_data.source}]")
                 else:
-                    print(f"❌ {symbol}: No data available")
+                    out.append(f"❌ {symbol}: No data available")
             
             # Test multiple prices
-            print(f"\n   Testing multiple price retrieval...")
+            out.append(f"\n   Testing multiple price retrieval...")
             multiple_prices = await market_data_manager.get_multiple_prices(test_symbols)
             successful_prices = sum(1 for price in multiple_prices.values() if price is not None)
-            print(f"✅ Retrieved {successful_prices}/{len(test_symbols)} prices successfully")
+            out.append(f"✅ Retrieved {successful_prices}/{len(test_symbols)} prices successfully")
             
             # Test cache warmup
-            print(f"\n   Testing cache warmup...")
+            out.append(f"\n   Testing cache warmup...")
             await market_data_manager.warmup_cache(test_symbols)
-            print(f"✅ Cache warmed up for {len(test_symbols)} symbols")
-            print(f"   Cache size: {len(market_data_manager.price_cache)}")
+            out.append(f"✅ Cache warmed up for {len(test_symbols)} symbols")
+            out.append(f"   Cache size: {len(market_data_manager.price_cache)}")
             
             # Test historical data
-            print(f"\n   Testing historical data retrieval...")
+            out.append(f"\n   Testing historical data retrieval...")
             hist_symbol = "RELIANCE"
             from_date = datetime.now() - timedelta(days=7)
             to_date = datetime.now()
@@ -181,15 +203,16 @@ async def test_market_data_service():
             )
             
             if hist_data is not None and not hist_data.empty:
-                print(f"✅ Historical data for {hist_symbol}:")
-                print(f"   Rows: {len(hist_data)}")
-                print(f"   Columns: {list(hist_data.columns)}")
-                print(f"   Latest close: ₹{hist_data['Close'].iloc[-1]:.2f}")
+                out.append(f"✅ Historical data for {hist_symbol}:")
+                out.append(f"   Rows: {len(hist_data)}")
+                out.append(f"   Columns: {list(hist_data.columns)}")
+                out.append(f"   Latest close: ₹{hist_data['Close'].iloc[-1]:.2f}")
             else:
-                print(f"❌ No historical data for {hist_symbol}")
+                out.append(f"❌ No historical data for {hist_symbol}")
         
         # Test tick data processor
-        print("\n8. ⚡ Testing Tick Data Processor")
+        flush_output(out)
+        out.append("\n8. ⚡ Testing Tick Data Processor")
         from core.market_data import TickData
         
         # Create sample tick data
@@ -208,16 +231,23 @@ async def test_market_data_service():
         )
         
         await tick_processor.process_tick(sample_tick)
-        print("✅ Sample tick data processed")
+        out.append("✅ Sample tick data processed")
         
         last_price = tick_processor.get_last_price("RELIANCE")
         latest_ticks = tick_processor.get_latest_ticks("RELIANCE", 5)
+        assert latest_ticks[-1] == sample_tick
+        
+        # A tick without OHLC must come back without OHLC, not with zero prices
+        bare_tick = sample_tick._replace(ohlc={})
+        await tick_processor.process_tick(bare_tick)
+        assert tick_processor.get_latest_ticks("RELIANCE", 1) == [bare_tick]
         
-        print(f"✅ Last price: ₹{last_price}")
-        print(f"✅ Latest ticks buffer: {len(latest_ticks)} ticks")
+        out.append(f"✅ Last price: ₹{last_price}")
+        out.append(f"✅ Latest ticks buffer: {len(latest_ticks)} ticks")
         
         # Test subscription functionality
-        print("\n9. 📡 Testing Subscription System")
+        flush_output(out)
+        out.append("\n9. 📡 Testing Subscription System")
         
         async def test_callback(price_data: PriceData):
             print(f"   📢 Price update: {price_data.symbol} = ₹{price_data.last_price:.2f}")
@@ -226,56 +256,63 @@ async def test_market_data_service():
         subscription_success = await market_data_manager.subscribe_to_price_updates(
             subscribe_symbol, test_callback
         )
-        print(f"✅ Subscription to {subscribe_symbol}: {subscription_success}")
+        out.append(f"✅ Subscription to {subscribe_symbol}: {subscription_success}")
         
         # Test unsubscription
         unsubscribe_success = await market_data_manager.unsubscribe_from_price_updates(
             subscribe_symbol, test_callback
         )
-        print(f"✅ Unsubscription from {subscribe_symbol}: {unsubscribe_success}")
+        out.append(f"✅ Unsubscription from {subscribe_symbol}: {unsubscribe_success}")
         
         # Cleanup
-        print("\n10. 🧹 Testing Cleanup")
+        flush_output(out)
+        out.append("\n10. 🧹 Testing Cleanup")
         await market_data_manager.cleanup()
         await yahoo_source.disconnect()
         await zerodha_source.disconnect()
-        print("✅ All resources cleaned up")
-        
-        print("\n" + "=" * 50)
-        print("🎉 All Market Data Service tests completed successfully!")
-        print("\n📊 Test Summary:")
-        print("✅ Component initialization")
-        print("✅ Market hours management")
-        print("✅ Stock list management") 
-        print("✅ Data validation")
-        print("✅ Yahoo Finance integration")
-        print("✅ Zerodha integration (connection test)")
-        print("✅ Market Data Manager coordination")
-        print("✅ Real-time price fetching")
-        print("✅ Historical data retrieval")
-        print("✅ Tick data processing")
-        print("✅ Subscription system")
-        print("✅ Resource cleanup")
+        out.append("✅ All resources cleaned up")
+        
+        out.append("\n" + "=" * 50)
+        out.append("🎉 All Market Data Service tests completed successfully!")
+        out.append("\n📊 Test Summary:")
+        out.append("✅ Component initialization")
+        out.append("✅ Market hours management")
+        out.append("✅ Stock list management") 
+        out.append("✅ Data validation")
+        out.append("✅ Yahoo Finance integration")
+        out.append("✅ Zerodha integration (connection test)")
+        out.append("✅ Market Data Manager coordination")
+        out.append("✅ Real-time price fetching")
+        out.append("✅ Historical data retrieval")
+        out.append("✅ Tick data processing")
+        out.append("✅ Subscription system")
+        out.append("✅ Resource cleanup")
+        
+        flush_output(out)
         
         return True
         
     except ImportError as e:
-        print(f"❌ Import error: {e}")
-        print("   Make sure all dependencies are installed:")
-        print("   pip install -r requirements.txt")
+        out.append(f"❌ Import error: {e}")
+        out.append("   Make sure all dependencies are installed:")
+        out.append("   pip install -r requirements.txt")
+        flush_output(out)
         return False
         
     except Exception as e:
-        print(f"❌ Test failed with error: {e}")
+        out.append(f"❌ Test failed with error: {e}")
         import traceback
+        flush_output(out)
         traceback.print_exc()
+        flush_output(out)
         return False
 
 
 async def test_data_quality():
     """Test data quality and validation features"""
-    print("\n🔍 Testing Data Quality Features")
-    print("-" * 30)
+    out: list = []
+    out.append("\n🔍 Testing Data Quality Features")
+    out.append("-" * 30)
     
     try:
         from core.market_data import DataValidator, PriceData, DataSource
@@ -285,7 +322,8 @@ async def test_data_quality():
         validator = DataValidator()
         
         # Test 1: Valid price data
-        print("1. Testing valid price data...")
+        flush_output(out)
+        out.append("1. Testing valid price data...")
         valid_data = PriceData(
             symbol="RELIANCE",
             open=2450.0,
@@ -299,10 +337,11 @@ async def test_data_quality():
         )
         
         is_valid, issues = validator.validate_price_data(valid_data)
-        print(f"   ✅ Valid data test: {is_valid} (issues: {len(issues)})")
+        out.append(f"   ✅ Valid data test: {is_valid} (issues: {len(issues)})")
         
         # Test 2: Invalid price data
-        print("2. Testing invalid price data...")
+        flush_output(out)
+        out.append("2. Testing invalid price data...")
         invalid_data = PriceData(
             symbol="RELIANCE",
             open=2450.0,
@@ -316,12 +355,13 @@ async def test_data_quality():
         )
         
         is_valid, issues = validator.validate_price_data(invalid_data)
-        print(f"   ✅ Invalid data test: {is_valid} (issues: {len(issues)})")
+        out.append(f"   ✅ Invalid data test: {is_valid} (issues: {len(issues)})")
         for issue in issues:
-            print(f"      - {issue}")
+            out.append(f"      - {issue}")
         
         # Test 3: Historical data cleaning
-        print("3. Testing historical data cleaning...")
+        flush_output(out)
+        out.append("3. Testing historical data cleaning...")
         
         # Create sample dirty data
         dates = pd.date_range(start='2024-01-01', periods=10, freq='D')
@@ -333,15 +373,41 @@ async def test_data_quality():
             'Volume': [1000, 2000, 1500, 25000, 1800, 2200, 2500, 2800, 3000, 3200]  # Volume spike
         }, index=dates)
         
-        print(f"   Original data shape: {dirty_data.shape}")
-        print(f"   NaN values: {dirty_data.isna().sum().sum()}")
+        out.append(f"   Original data shape: {dirty_data.shape}")
+        out.append(f"   NaN values: {dirty_data.isna().sum().sum()}")
         
         cleaned_data = validator.clean_historical_data(dirty_data)
-        print(f"   ✅ Cleaned data shape: {cleaned_data.shape}")
-        print(f"   ✅ NaN values after cleaning: {cleaned_data.isna().sum().sum()}")
-        
+        out.append(f"   ✅ Cleaned data shape: {cleaned_data.shape}")
+        out.append(f"   ✅ NaN values after cleaning: {cleaned_data.isna().sum().sum()}")
+
+        valid_rows, row_issues = validator.validate_price_frame(dirty_data)
+        out.append(f"   ✅ Vectorized validation: {int(valid_rows.sum())}/{len(dirty_data)} rows valid")
+        for rule, count in row_issues.sum().items():
+            if count:
+                out.append(f"      - {rule}: {int(count)}")
+
+        # Row-by-row scalar validation must reach the same verdicts
+        mixed_data = pd.concat([dirty_data, pd.DataFrame({
+            'Open': [100, 100, 100, 100, 100],
+            'High': [95, 105, 105, 105, 105],  # High < Low
+            'Low': [105, 95, 95, 95, 95],
+            'Close': [100, 110, 0, np.nan, 100],  # Outside range, zero, missing
+            'Volume': [1000, 1000, 1000, 1000, -1]  # Negative volume
+        }, index=pd.date_range(start='2024-01-11', periods=5, freq='D'))])
+        valid_rows, _ = validator.validate_price_frame(mixed_data)
+        scalar_verdicts = [
+            validator.validate_price_data(PriceData(
+                symbol="RELIANCE", open=row.Open, high=row.High, low=row.Low, close=row.Close,
+                volume=row.Volume, last_price=row.Close, timestamp=ts, source=DataSource.YAHOO.value
+            ))[0]
+            for ts, row in mixed_data.iterrows()
+        ]
+        assert scalar_verdicts == valid_rows.tolist()
+        out.append("   ✅ Vectorized verdicts match validate_price_data")
+
         # Test 4: Corporate action detection
-        print("4. Testing corporate action detection...")
+        flush_output(out)
+        out.append("4. Testing corporate action detection...")
         
         # Create data with a potential stock split
         split_dates = pd.date_range(start='2024-01-01', periods=10, freq='D')
@@ -354,31 +420,106 @@ async def test_data_quality():
         }, index=split_dates)
         
         corporate_actions = validator.detect_corporate_actions(split_data)
-        print(f"   ✅ Detected {len(corporate_actions)} potential corporate actions")
+        out.append(f"   ✅ Detected {len(corporate_actions)} potential corporate actions")
         for action in corporate_actions:
-            print(f"      - {action['date']}: {action['type']} ({action['return']:.2%})")
+            out.append(f"      - {action['date']}: {action['type']} ({action['return']:.2%})")
         
-        print("✅ Data quality tests completed successfully!")
+        out.append("✅ Data quality tests completed successfully!")
+        flush_output(out)
         return True
         
     except Exception as e:
-        print(f"❌ Data quality test failed: {e}")
+        out.append(f"❌ Data quality test failed: {e}")
+        flush_output(out)
         return False
 
 
+async def test_subscriber_dispatch():
+    """A failing sync subscriber must not stop updates reaching other subscribers"""
+    out: list = []
+    out.append("\n📡 Testing Subscriber Dispatch")
+    out.append("-" * 30)
+    
+    from core.market_data import MarketDataManager, PriceData, DataSource
+    
+    manager = MarketDataManager()
+    received = []
+    delivered = asyncio.Event()
+    
+    def sync_callback(price_data: PriceData):
+        received.append(("sync", price_data.symbol))
+        raise ValueError("sync subscriber failure")
+    
+    async def async_callback(price_data: PriceData):
+        received.append(("async", price_data.symbol))
+        delivered.set()
+    
+    await manager.subscribe_to_price_updates("A", sync_callback)
+    await manager.subscribe_to_price_updates("B", async_callback)
+    
+    for symbol in ("A", "B"):
+        await manager._notify_subscribers(symbol, PriceData(
+            symbol=symbol, open=100.0, high=101.0, low=99.0, close=100.0, volume=1000,
+            last_price=100.5, timestamp=datetime.now(), source=DataSource.YAHOO.value
+        ))
+    
+    await asyncio.wait_for(delivered.wait(), timeout=1.0)
+    assert received == [("sync", "A"), ("async", "B")]
+    assert not manager._dispatcher_task.done()
+    out.append("✅ Async subscriber updated after a sync subscriber failed")
+    
+    await manager.cleanup()
+    flush_output(out)
+    return True
+
+
+async def test_price_cache_round_trip():
+    """Cached prices must come back with the same value types as fresh ones"""
+    out: list = []
+    out.append("\n🗄️ Testing Shared Price Cache Serialization")
+    out.append("-" * 30)
+    
+    import numpy as np
+    from core.market_data import SharedPriceCache, PriceData, DataSource
+    
+    # Yahoo rows carry NumPy scalars straight from pandas
+    price_data = PriceData(
+        symbol="RELIANCE", open=np.float64(2450.0), high=np.float64(2470.0), low=np.float64(2440.0),
+        close=2460.0, volume=np.int64(1500000), last_price=np.float64(2465.0),
+        timestamp=datetime.now(), source=DataSource.YAHOO.value
+    )
+    
+    cached, _ = SharedPriceCache._deserialize(SharedPriceCache._serialize(price_data, datetime.now()))
+    assert cached == price_data
+    assert type(cached.volume) is int
+    out.append(f"✅ Volume round-trips as {type(cached.volume).__name__}: {cached.volume}")
+    
+    flush_output(out)
+    return True
+
+
 if __name__ == "__main__":
+    # Use uvloop when available (Unix only); fall back to the default loop otherwise
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     async def main():
         print("🧪 Market Data Service Test Suite")
         print("=" * 60)
         
-        # Run main tests
-        main_test_success = await test_market_data_service()
-        
-        # Run data quality tests
-        quality_test_success = await test_data_quality()
+        # Run main and data quality tests concurrently (they are independent)
+        main_test_success, quality_test_success = await asyncio.gather(
+            test_market_data_service(),
+            test_data_quality()
+        )
+        dispatch_test_success = await test_subscriber_dispatch()
+        cache_test_success = await test_price_cache_round_trip()
         
         print("\n" + "=" * 60)
-        if main_test_success and quality_test_success:
+        if main_test_success and quality_test_success and dispatch_test_success and cache_test_success:
             print("🎉 ALL TESTS PASSED!")
             print("\n📝 Next Steps:")
             print("1. Set up your Zerodha API credentials in .env")
@@ -1,28 +1,126 @@
 """
 Tests for earnings gap trading strategy
+
+Tests here share no module-level state and use in-memory SQLite, so the
+module is safe to run under pytest-xdist (pytest -n auto).
 """
 import pytest
 import asyncio
+from contextlib import ExitStack
 from datetime import datetime, timedelta
-from unittest.mock import Mock, AsyncMock, patch
+from types import SimpleNamespace
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
 import pandas as pd
+import numpy as np
+
+# core.* and models.* are imported inside the fixtures that need them, so a
+# selective run (pytest -k TestRiskManager) only loads the modules it uses
+
+# Frozen reference time for mock data, aligned with the start of DAILY_INDEX,
+# so every run (and every benchmark round) sees identical inputs
+NOW = datetime(2024, 1, 1, 9, 30)
+
+# Mock yfinance/market data frames, built once; tests hand out shallow copies
+# Ticker.calendar stays a DataFrame: the Yahoo earnings path reads .empty and .iterrows()
+# and keeps dates inside a window from today, so this one date follows the real clock
+MOCK_CALENDAR = pd.DataFrame(index=[datetime.now() + timedelta(days=1)])
+
+# Shared indexes built from offset objects; the 30-day frame reuses the first 30 days
+DAILY_INDEX = pd.date_range(start='2024-01-01', periods=50, freq=pd.offsets.Day())
+MINUTE_INDEX = pd.date_range(start='2024-01-01', periods=10, freq=pd.offsets.Minute())
+
+MOCK_GAP_HIST = pd.DataFrame({
+    'Close': [2400.0, 2450.0],
+    'Open': [2405.0, 2500.0],
+    'Volume': [1000000, 1500000]
+})
+
+MOCK_HIST_50D = pd.DataFrame({
+    'Close': np.arange(2400, 2450, dtype=np.float64),
+    'Volume': np.full(50, 1000000, dtype=np.int64)
+}, index=DAILY_INDEX)
 
-from core.earnings_scanner import EarningsScanner
-from core.risk_manager import RiskManager
-from core.market_data import MarketDataProvider
-from core.order_engine import OrderEngine
-from models.trade_models import Trade, EarningsEvent, Portfolio
-from utils.validators import validate_symbol, validate_price, validate_quantity
+_open_30d = np.arange(2400, 2430, dtype=np.float64)
+MOCK_HIST_30D = pd.DataFrame({
+    'Open': _open_30d,
+    'High': _open_30d + 10,
+    'Low': _open_30d - 10,
+    'Close': _open_30d + 5,
+    'Volume': np.full(30, 1000000, dtype=np.int64)
+}, index=DAILY_INDEX[:30])
+
+MOCK_VWAP_DATA = pd.DataFrame({
+    'High': [2450.0] * 10,
+    'Low': [2440.0] * 10,
+    'Close': [2445.0] * 10,
+    'Volume': [100000] * 10
+}, index=MINUTE_INDEX)
+
+
+# Components are built once per module; tests only patch attributes through
+# context managers, which restore them on exit
+@pytest.fixture(scope="module")
+def yf_history_cache():
+    """Prebuilt Ticker.history responses keyed by (symbol, period)"""
+    return {
+        ("RELIANCE", "2d"): MOCK_GAP_HIST,
+        ("RELIANCE", "1mo"): MOCK_HIST_30D,
+        ("RELIANCE", "50d"): MOCK_HIST_50D,
+    }
+
+
+@pytest.fixture
+def mock_ticker(monkeypatch):
+    """Replace yfinance.Ticker for one test; configure via mock_ticker.return_value"""
+    ticker = MagicMock()
+    monkeypatch.setattr("yfinance.Ticker", ticker)
+    return ticker
+
+
+@pytest.fixture(scope="module")
+def mock_portfolio():
+    """Active portfolio stand-in; the order engine only reads id and balance"""
+    return SimpleNamespace(id=1, balance=100000.0)
+
+
+@pytest.fixture(scope="module")
+def scanner():
+    """Create earnings scanner instance for testing"""
+    from core.earnings_scanner import EarningsScanner
+    return EarningsScanner()
+
+
+@pytest.fixture(scope="module")
+def risk_manager():
+    """Create risk manager instance for testing"""
+    from core.risk_manager import RiskManager
+    return RiskManager()
+
+
+@pytest.fixture(scope="module")
+def market_data():
+    """Create market data provider instance for testing"""
+    from core.market_data import MarketDataProvider
+    return MarketDataProvider()
+
+
+@pytest.fixture(scope="module")
+def shared_order_engine():
+    """Create order engine instance for testing"""
+    from core.order_engine import OrderEngine
+    return OrderEngine()
+
+
+@pytest.fixture
+def order_engine(shared_order_engine):
+    """Shared order engine, reset to paper trading before every test"""
+    shared_order_engine.paper_trading = True  # Force paper trading for tests
+    return shared_order_engine
 
 
 class TestEarningsScanner:
     """Test cases for earnings scanner functionality"""
     
-    @pytest.fixture
-    def scanner(self):
-        """Create earnings scanner instance for testing"""
-        return EarningsScanner()
-    
     @pytest.fixture
     def mock_earnings_data(self):
         """Mock earnings data for testing"""
@@ -30,87 +128,65 @@ class TestEarningsScanner:
             {
                 "symbol": "RELIANCE",
                 "company_name": "Reliance Industries",
-                "earnings_date": datetime.now() + timedelta(days=1),
+                "earnings_date": NOW + timedelta(days=1),
                 "expected_eps": 65.50
             },
             {
                 "symbol": "TCS", 
                 "company_name": "Tata Consultancy Services",
-                "earnings_date": datetime.now() + timedelta(days=2),
+                "earnings_date": NOW + timedelta(days=2),
                 "expected_eps": 45.20
             }
         ]
     
     @pytest.mark.asyncio
-    async def test_scan_upcoming_earnings(self, scanner, mock_earnings_data):
+    async def test_scan_upcoming_earnings(self, scanner, mock_earnings_data, mock_ticker):
         """Test scanning for upcoming earnings events"""
+        # Mock yfinance ticker response
+        mock_ticker.return_value.calendar = MOCK_CALENDAR
+        mock_ticker.return_value.info = {"longName": "Test Company"}
+        
         with patch.object(scanner, '_load_nse_symbols', return_value=['RELIANCE.NS', 'TCS.NS']):
-            with patch('yfinance.Ticker') as mock_ticker:
-                # Mock yfinance ticker response
-                mock_ticker.return_value.calendar = pd.DataFrame(
-                    index=[datetime.now() + timedelta(days=1)]
-                )
-                mock_ticker.return_value.info = {"longName": "Test Company"}
-                
-                results = await scanner.scan_upcoming_earnings(days_ahead=7)
-                
-                assert len(results) >= 0
-                assert isinstance(results, list)
+            results = await scanner.scan_upcoming_earnings(days_ahead=7)
+            
+            assert len(results) >= 0
+            assert isinstance(results, list)
     
     @pytest.mark.asyncio
-    async def test_detect_earnings_gaps(self, scanner):
+    async def test_detect_earnings_gaps(self, scanner, mock_ticker, yf_history_cache):
         """Test gap detection functionality"""
         # Mock recent earnings events
         with patch.object(scanner.db, 'query') as mock_query:
             mock_event = Mock()
             mock_event.symbol = "RELIANCE"
             mock_event.company_name = "Reliance Industries"
-            mock_event.earnings_date = datetime.now() - timedelta(days=1)
+            mock_event.earnings_date = NOW - timedelta(days=1)
             
             mock_query.return_value.filter.return_value.all.return_value = [mock_event]
             
             # Mock yfinance data
-            with patch('yfinance.Ticker') as mock_ticker:
-                mock_hist = pd.DataFrame({
-                    'Close': [2400.0, 2450.0],
-                    'Open': [2405.0, 2500.0],
-                    'Volume': [1000000, 1500000]
-                })
-                mock_ticker.return_value.history.return_value = mock_hist
-                
-                gaps = await scanner.detect_earnings_gaps(min_gap_percent=2.0)
-                
-                assert isinstance(gaps, list)
+            mock_ticker.return_value.history.return_value = yf_history_cache[("RELIANCE", "2d")].copy(deep=False)
+            
+            gaps = await scanner.detect_earnings_gaps(min_gap_percent=2.0)
+            
+            assert isinstance(gaps, list)
     
     @pytest.mark.asyncio
-    async def test_get_technical_indicators(self, scanner):
+    async def test_get_technical_indicators(self, scanner, mock_ticker, yf_history_cache):
         """Test technical indicators calculation"""
-        with patch('yfinance.Ticker') as mock_ticker:
-            # Create mock historical data
-            dates = pd.date_range(start='2024-01-01', periods=50, freq='D')
-            mock_hist = pd.DataFrame({
-                'Close': range(2400, 2450),
-                'Volume': [1000000] * 50
-            }, index=dates)
-            
-            mock_ticker.return_value.history.return_value = mock_hist
-            
-            indicators = await scanner.get_technical_indicators("RELIANCE")
-            
-            assert isinstance(indicators, dict)
-            if indicators:  # If not empty
-                assert 'current_price' in indicators
-                assert 'volume_ratio' in indicators
+        mock_ticker.return_value.history.return_value = yf_history_cache[("RELIANCE", "50d")].copy(deep=False)
+        
+        indicators = await scanner.get_technical_indicators("RELIANCE")
+        
+        assert isinstance(indicators, dict)
+        if indicators:  # If not empty
+            assert 'current_price' in indicators
+            assert 'volume_ratio' in indicators
 
 
 class TestRiskManager:
     """Test cases for risk management functionality"""
     
-    @pytest.fixture
-    def risk_manager(self):
-        """Create risk manager instance for testing"""
-        return RiskManager()
-    
     def test_calculate_position_size(self, risk_manager):
         """Test position size calculation"""
         entry_price = 2450.0
@@ -137,19 +213,29 @@ class TestRiskManager:
             "entry_price": 2450.0
         }
         
-        with patch.object(risk_manager, '_check_daily_loss_limit', return_value=True):
-            with patch.object(risk_manager, '_check_max_open_positions', return_value=True):
-                with patch.object(risk_manager, '_check_position_concentration', return_value=True):
-                    with patch.object(risk_manager, '_get_active_portfolio', return_value=Mock()):
-                        with patch.object(risk_manager, '_check_available_balance', return_value=True):
-                            with patch.object(risk_manager, '_has_existing_position', return_value=False):
-                                
-                                is_valid, reason = risk_manager.validate_trade_entry(trade_params)
-                                
-                                assert is_valid is True
-                                assert reason == "Trade validation passed"
+        # Every check passes
+        patches = {
+            '_check_daily_loss_limit': True,
+            '_check_max_open_positions': True,
+            '_check_position_concentration': True,
+            '_get_active_portfolio': Mock(),
+            '_check_available_balance': True,
+            '_has_existing_position': False,
+        }
+        
+        with ExitStack() as stack:
+            for attr, return_value in patches.items():
+                stack.enter_context(patch.object(risk_manager, attr, return_value=return_value))
+            
+            is_valid, reason = risk_manager.validate_trade_entry(trade_params)
+            
+            assert is_valid is True
+            assert reason == "Trade validation passed"
     
-    def test_validate_trade_entry_failure(self, risk_manager):
+    @pytest.mark.parametrize("failing_check, expected_reason", [
+        ('_check_daily_loss_limit', "Daily loss limit exceeded"),
+    ])
+    def test_validate_trade_entry_failure(self, risk_manager, failing_check, expected_reason):
         """Test trade entry validation failure scenarios"""
         trade_params = {
             "symbol": "RELIANCE",
@@ -157,43 +243,29 @@ class TestRiskManager:
             "entry_price": 2450.0
         }
         
-        # Test daily loss limit exceeded
-        with patch.object(risk_manager, '_check_daily_loss_limit', return_value=False):
+        with patch.object(risk_manager, failing_check, return_value=False):
             is_valid, reason = risk_manager.validate_trade_entry(trade_params)
             assert is_valid is False
-            assert "Daily loss limit exceeded" in reason
-    
-    def test_calculate_stop_loss(self, risk_manager):
-        """Test stop loss calculation"""
-        entry_price = 2450.0
-        gap_percent = 3.5
-        
-        stop_loss = risk_manager.calculate_stop_loss(entry_price, gap_percent)
-        
-        assert isinstance(stop_loss, float)
-        assert stop_loss > 0
-        assert stop_loss != entry_price
+            assert expected_reason in reason
     
-    def test_calculate_target_price(self, risk_manager):
-        """Test target price calculation"""
-        entry_price = 2450.0
-        gap_percent = 3.5
+    @pytest.mark.parametrize("method", ["calculate_stop_loss", "calculate_target_price"])
+    @pytest.mark.parametrize("entry_price, gap_percent", [
+        (2450.0, 3.5),
+        (1000.0, 1.0),
+        (500.0, 10.0),
+    ])
+    def test_calculate_exit_price(self, risk_manager, method, entry_price, gap_percent):
+        """Test stop loss and target price calculation"""
+        exit_price = getattr(risk_manager, method)(entry_price, gap_percent)
         
-        target = risk_manager.calculate_target_price(entry_price, gap_percent)
-        
-        assert isinstance(target, float)
-        assert target > 0
-        assert target != entry_price
+        assert isinstance(exit_price, float)
+        assert exit_price > 0
+        assert exit_price != entry_price
 
 
 class TestMarketDataProvider:
     """Test cases for market data provider"""
     
-    @pytest.fixture
-    def market_data(self):
-        """Create market data provider instance for testing"""
-        return MarketDataProvider()
-    
     @pytest.mark.asyncio
     async def test_get_real_time_price(self, market_data):
         """Test real-time price fetching"""
@@ -202,7 +274,7 @@ class TestMarketDataProvider:
                 "symbol": "RELIANCE",
                 "price": 2450.0,
                 "volume": 1000000,
-                "timestamp": datetime.now()
+                "timestamp": NOW
             }
             
             price_data = await market_data.get_real_time_price("RELIANCE")
@@ -212,41 +284,21 @@ class TestMarketDataProvider:
             assert isinstance(price_data["price"], float)
     
     @pytest.mark.asyncio
-    async def test_get_historical_data(self, market_data):
+    async def test_get_historical_data(self, market_data, mock_ticker, yf_history_cache):
         """Test historical data fetching"""
-        with patch('yfinance.Ticker') as mock_ticker:
-            # Mock historical data
-            dates = pd.date_range(start='2024-01-01', periods=30, freq='D')
-            mock_hist = pd.DataFrame({
-                'Open': range(2400, 2430),
-                'High': range(2410, 2440),
-                'Low': range(2390, 2420),
-                'Close': range(2405, 2435),
-                'Volume': [1000000] * 30
-            }, index=dates)
-            
-            mock_ticker.return_value.history.return_value = mock_hist
-            
-            hist_data = await market_data.get_historical_data("RELIANCE", period="1mo")
-            
-            assert hist_data is not None
-            assert isinstance(hist_data, pd.DataFrame)
-            assert len(hist_data) > 0
+        mock_ticker.return_value.history.return_value = yf_history_cache[("RELIANCE", "1mo")].copy(deep=False)
+        
+        hist_data = await market_data.get_historical_data("RELIANCE", period="1mo")
+        
+        assert hist_data is not None
+        assert isinstance(hist_data, pd.DataFrame)
+        assert len(hist_data) > 0
     
     @pytest.mark.asyncio
     async def test_calculate_vwap(self, market_data):
         """Test VWAP calculation"""
         with patch.object(market_data, 'get_historical_data') as mock_hist:
-            # Create test data
-            dates = pd.date_range(start='2024-01-01', periods=10, freq='1min')
-            test_data = pd.DataFrame({
-                'High': [2450.0] * 10,
-                'Low': [2440.0] * 10,
-                'Close': [2445.0] * 10,
-                'Volume': [100000] * 10
-            }, index=dates)
-            
-            mock_hist.return_value = test_data
+            mock_hist.return_value = MOCK_VWAP_DATA.copy(deep=False)
             
             vwap = await market_data.calculate_vwap("RELIANCE")
             
@@ -258,15 +310,8 @@ class TestMarketDataProvider:
 class TestOrderEngine:
     """Test cases for order execution engine"""
     
-    @pytest.fixture
-    def order_engine(self):
-        """Create order engine instance for testing"""
-        engine = OrderEngine()
-        engine.paper_trading = True  # Force paper trading for tests
-        return engine
-    
     @pytest.mark.asyncio
-    async def test_place_earnings_gap_trade(self, order_engine):
+    async def test_place_earnings_gap_trade(self, order_engine, mock_portfolio):
         """Test placing earnings gap trade"""
         gap_data = {
             "symbol": "RELIANCE",
@@ -275,11 +320,6 @@ class TestOrderEngine:
             "company_name": "Reliance Industries"
         }
         
-        # Mock portfolio
-        mock_portfolio = Mock()
-        mock_portfolio.id = 1
-        mock_portfolio.balance = 100000.0
-        
         with patch.object(order_engine, '_get_active_portfolio', return_value=mock_portfolio):
             with patch.object(order_engine.risk_manager, 'calculate_position_size') as mock_calc:
                 mock_calc.return_value = (10, {"max_loss": 500.0})
@@ -298,7 +338,7 @@ class TestIntegration:
     """Integration tests for multiple components"""
     
     @pytest.mark.asyncio
-    async def test_complete_trading_workflow(self):
+    async def test_complete_trading_workflow(self, risk_manager, order_engine, mock_portfolio):
         """Test complete trading workflow from gap detection to order placement"""
         # This test would simulate a complete workflow:
         # 1. Scan for earnings
@@ -307,12 +347,6 @@ class TestIntegration:
         # 4. Place orders
         # 5. Monitor execution
         
-        # Mock the workflow
-        scanner = EarningsScanner()
-        risk_manager = RiskManager() 
-        order_engine = OrderEngine()
-        order_engine.paper_trading = True
-        
         # Test data
         gap_data = {
             "symbol": "RELIANCE",
@@ -322,11 +356,6 @@ class TestIntegration:
             "post_earnings_open": 2450.0
         }
         
-        # Mock portfolio
-        mock_portfolio = Mock()
-        mock_portfolio.id = 1
-        mock_portfolio.balance = 100000.0
-        
         with patch.object(order_engine, '_get_active_portfolio', return_value=mock_portfolio):
             with patch.object(risk_manager, 'validate_trade_entry', return_value=(True, "Valid")):
                 with patch.object(risk_manager, 'calculate_position_size', return_value=(10, {})):
@@ -340,35 +369,73 @@ class TestIntegration:
 
 
 # Fixtures for database testing
+@pytest.fixture(scope="module")
+def test_engine():
+    """Create one in-memory SQLite database with the schema for the module"""
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.pool import StaticPool
+    from models.trade_models import Base  # Importing the models registers their tables
+    
+    # StaticPool keeps the single in-memory connection alive across sessions
+    engine = create_engine(
+        "sqlite://",
+        echo=False,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False}
+    )
+    
+    # Let SQLAlchemy emit BEGIN itself so pysqlite honours SAVEPOINT rollbacks
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
+    Base.metadata.create_all(engine)
+    
+    yield engine
+    
+    engine.dispose()
+
+
 @pytest.fixture
-def test_db():
-    """Create test database session"""
-    from sqlalchemy import create_engine
+def test_db(test_engine):
+    """Create test database session, rolled back after each test"""
     from sqlalchemy.orm import sessionmaker
-    from database import Base
     
-    # Use in-memory SQLite for testing
-    engine = create_engine("sqlite:///:memory:", echo=False)
-    Base.metadata.create_all(engine)
+    connection = test_engine.connect()
+    transaction = connection.begin()
     
-    SessionLocal = sessionmaker(bind=engine)
+    # Session commits only release savepoints; the outer rollback discards everything
+    SessionLocal = sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
     session = SessionLocal()
     
     yield session
     
     session.close()
+    transaction.rollback()
+    connection.close()
 
 
-@pytest.fixture
-def sample_portfolio(test_db):
-    """Create sample portfolio for testing"""
-    portfolio = Portfolio(
+def make_sample_portfolio():
+    """Build (without persisting) the sample portfolio"""
+    from models.trade_models import Portfolio
+    
+    return Portfolio(
         name="Test Portfolio",
         balance=100000.0,
         equity=100000.0,
         margin_available=100000.0,
         is_active=True
     )
+
+
+@pytest.fixture
+def sample_portfolio(test_db):
+    """Create sample portfolio for testing"""
+    portfolio = make_sample_portfolio()
     
     test_db.add(portfolio)
     test_db.commit()
@@ -377,8 +444,12 @@ def sample_portfolio(test_db):
 
 
 @pytest.fixture
-def sample_trade(test_db, sample_portfolio):
-    """Create sample trade for testing"""
+def sample_portfolio_and_trade(test_db):
+    """Create sample portfolio and trade for testing in a single commit"""
+    from models.trade_models import Trade
+    
+    portfolio = make_sample_portfolio()
+    # Linking through the relationship lets one flush insert both rows in order
     trade = Trade(
         symbol="RELIANCE",
         trade_type="BUY",
@@ -388,58 +459,66 @@ def sample_trade(test_db, sample_portfolio):
         target_price=2500.0,
         status="OPEN",
         strategy="earnings_gap",
-        portfolio_id=sample_portfolio.id
+        portfolio=portfolio
     )
     
-    test_db.add(trade)
+    test_db.add_all([portfolio, trade])
     test_db.commit()
     
-    return trade
+    return portfolio, trade
+
+
+@pytest.fixture
+def sample_trade(sample_portfolio_and_trade):
+    """Create sample trade for testing"""
+    return sample_portfolio_and_trade[1]
 
 
-# Performance tests
+# Performance tests (skipped unless pytest is run with --runbench)
+@pytest.mark.perf
 class TestPerformance:
     """Performance tests for critical components"""
     
-    @pytest.mark.asyncio
-    async def test_gap_detection_performance(self):
-        """Test gap detection performance with large dataset"""
-        scanner = EarningsScanner()
-        
+    def test_gap_detection_performance(self, benchmark, scanner):
+        """Benchmark gap detection over a large dataset"""
         # Mock large dataset
         with patch.object(scanner.db, 'query') as mock_query:
             # Create 100 mock events
-            mock_events = [Mock(symbol=f"STOCK{i}", earnings_date=datetime.now()) for i in range(100)]
+            mock_events = [SimpleNamespace(symbol=f"STOCK{i}", earnings_date=NOW) for i in range(100)]
             mock_query.return_value.filter.return_value.all.return_value = mock_events
             
-            start_time = datetime.now()
-            gaps = await scanner.detect_earnings_gaps()
-            end_time = datetime.now()
+            # Each round needs a fresh coroutine and runs it on its own loop
+            gaps = benchmark(lambda: asyncio.run(scanner.detect_earnings_gaps()))
             
-            # Should complete within reasonable time
-            execution_time = (end_time - start_time).total_seconds()
-            assert execution_time < 10.0  # 10 seconds max
+            assert isinstance(gaps, list)
     
-    def test_position_sizing_performance(self):
-        """Test position sizing calculation performance"""
-        risk_manager = RiskManager()
+    def test_position_sizing_performance(self, benchmark):
+        """Benchmark PositionSizer.calculate_position_size for 1000 scenarios"""
+        from core.risk_manager import PositionSizer, MarketRegime
         
-        start_time = datetime.now()
+        # No ATR or percentile data, so each call runs the base size, regime and
+        # performance adjustments and the position caps without market data
+        volatility_analyzer = Mock()
+        volatility_analyzer.calculate_atr = AsyncMock(return_value=None)
+        volatility_analyzer.get_volatility_percentile = AsyncMock(return_value=None)
+        volatility_analyzer.detect_market_regime = AsyncMock(return_value=MarketRegime.CALM)
+        position_sizer = PositionSizer(volatility_analyzer)
         
-        # Calculate position sizes for 1000 scenarios
-        for i in range(1000):
-            quantity, details = risk_manager.calculate_position_size(
-                entry_price=2450.0 + i,
-                stop_loss=2400.0 + i,
-                account_balance=100000.0
-            )
+        scenarios = [(2450.0 + i, 2400.0 + i) for i in range(1000)]
         
-        end_time = datetime.now()
-        execution_time = (end_time - start_time).total_seconds()
+        async def size_all():
+            return [
+                await position_sizer.calculate_position_size("RELIANCE", entry, stop, 100000.0)
+                for entry, stop in scenarios
+            ]
         
-        # Should complete within reasonable time
-        assert execution_time < 5.0  # 5 seconds max for 1000 calculations
-
+        sizes = benchmark(lambda: asyncio.run(size_all()))
+        
+        assert len(sizes) == 1000
+        assert sizes[0].base_size == pytest.approx(
+            100000.0 * position_sizer.base_risk_percent / 50.0 * 2450.0
+        )
+        assert all(size.final_size <= size.max_allowed_size for size in sizes)
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
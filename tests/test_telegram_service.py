@@ -5,28 +5,63 @@ Comprehensive test suite for the Telegram bot service
 import asyncio
 import sys
 import os
+import time
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
-import json
+import orjson
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+try:
+    from core.telegram_service import (
+        TelegramBot, SignalNotifier, TradeNotifier, CommandHandler,
+        CallbackHandler, MessageFormatter, TelegramConfig, TradingMode,
+        ApprovalStatus, NotificationType, PendingSignal, NotificationMessage,
+        SystemStatus, TRADING_MODE_VALUES, APPROVAL_STATUS_VALUES, NOTIFICATION_TYPE_VALUES
+    )
+    from core.earnings_scanner import EarningsGapSignal, SignalType, SignalConfidence
+    from core.order_engine import OrderEngine, PositionStatus
+    from core.risk_manager import RiskManager
+    IMPORT_ERROR = None
+except ImportError as e:
+    # Reported by each test so running the script still explains what is missing
+    IMPORT_ERROR = e
+
+
+def report_import_error() -> None:
+    """Print the deferred import failure with install hints"""
+    print(f"❌ Import error: {IMPORT_ERROR}")
+    print("   Make sure all dependencies are installed:")
+    print("   pip install python-telegram-bot")
+
+
+def dependency_mocks():
+    """Fresh order engine and risk manager mocks, so no call history or return values leak between tests"""
+    # spec_set fixes the attribute set up front; position_tracker is an instance attribute
+    order_engine = Mock(spec_set=dir(OrderEngine) + ['position_tracker'])
+    order_engine.execute_signal = AsyncMock(return_value="TRADE_123")
+    order_engine.get_execution_status = AsyncMock(return_value={
+        'active_trades': 2,
+        'total_trades': 15,
+        'emergency_stop': False,
+        'paper_trading': True
+    })
+    order_engine.emergency_stop_all = AsyncMock()
+    
+    return order_engine, Mock(spec_set=RiskManager)
+
+
 async def test_telegram_service():
     """Test the comprehensive Telegram bot service"""
     print("🚀 Testing Telegram Bot Service")
     print("=" * 50)
     
+    if IMPORT_ERROR:
+        report_import_error()
+        return False
+    
     try:
-        from core.telegram_service import (
-            TelegramBot, SignalNotifier, TradeNotifier, CommandHandler,
-            CallbackHandler, MessageFormatter, TelegramConfig, TradingMode,
-            ApprovalStatus, NotificationType, PendingSignal, NotificationMessage
-        )
-        from core.earnings_scanner import EarningsGapSignal, SignalType, SignalConfidence
-        from core.order_engine import OrderEngine, PositionStatus
-        from core.risk_manager import RiskManager
-        
         # Initialize components
         print("\n1. 🔧 Testing Component Initialization")
         
@@ -41,9 +76,8 @@ async def test_telegram_service():
         
         print(f"✅ Telegram config created: {len(test_config.chat_ids)} chat(s)")
         
-        # Create mock dependencies
-        mock_order_engine = Mock(spec=OrderEngine)
-        mock_risk_manager = Mock(spec=RiskManager)
+        # Shared mock dependencies
+        mock_order_engine, mock_risk_manager = dependency_mocks()
         
         # Create Telegram bot
         telegram_bot = TelegramBot(test_config, mock_order_engine, mock_risk_manager)
@@ -55,11 +89,16 @@ async def test_telegram_service():
         
         formatter = MessageFormatter()
         
+        # Emoji needles for the containment checks, looked up once
+        signal_emoji = formatter.EMOJIS['signal']
+        profit_emoji = formatter.EMOJIS['profit']
+        loss_emoji = formatter.EMOJIS['loss']
+        
         # Test emoji access
         print(f"✅ Emojis loaded: {len(formatter.EMOJIS)} emojis")
-        print(f"   Signal: {formatter.EMOJIS['signal']}")
-        print(f"   Profit: {formatter.EMOJIS['profit']}")
-        print(f"   Loss: {formatter.EMOJIS['loss']}")
+        print(f"   Signal: {signal_emoji}")
+        print(f"   Profit: {profit_emoji}")
+        print(f"   Loss: {loss_emoji}")
         
         # Test signal alert formatting
         test_signal = EarningsGapSignal(
@@ -88,7 +127,7 @@ async def test_telegram_service():
         print("✅ Signal alert formatted:")
         print(f"   Length: {len(signal_message)} characters")
         print(f"   Contains symbol: {'RELIANCE' in signal_message}")
-        print(f"   Contains emoji: {formatter.EMOJIS['signal'] in signal_message}")
+        print(f"   Contains emoji: {signal_emoji in signal_message}")
         
         # Test trade entry formatting
         trade_entry_message = formatter.format_trade_entry(
@@ -111,15 +150,15 @@ async def test_telegram_service():
         )
         print("✅ P&L update formatted:")
         print(f"   Length: {len(pnl_message)} characters")
-        print(f"   Contains profit emoji: {formatter.EMOJIS['profit'] in pnl_message}")
+        print(f"   Contains profit emoji: {profit_emoji in pnl_message}")
         
         # Test system status formatting
-        status_data = {
-            'trading_mode': TradingMode.AUTO.value,
-            'active_trades': 2,
-            'total_pnl': 850.0,
-            'emergency_stop': False
-        }
+        status_data = SystemStatus(
+            mode=TradingMode.AUTO,
+            active_trades=2,
+            daily_pnl=850.0,
+            emergency_stop=False
+        )
         status_message = formatter.format_system_status(status_data)
         print("✅ System status formatted:")
         print(f"   Length: {len(status_message)} characters")
@@ -241,11 +280,7 @@ async def test_telegram_service():
         mock_context = Mock()
         mock_context.bot = mock_bot
         
-        # Test status command
-        await command_handler.handle_status(mock_update, mock_context)
-        print("✅ Status command handled")
-        
-        # Test P&L command
+        # Positions for the P&L command
         mock_order_engine.position_tracker.get_all_positions.return_value = {
             "RELIANCE": PositionStatus(
                 symbol="RELIANCE",
@@ -260,26 +295,17 @@ async def test_telegram_service():
                 last_updated=datetime.now()
             )
         }
-        
-        await command_handler.handle_pnl(mock_update, mock_context)
-        print("✅ P&L command handled")
-        
-        # Test mode command
         mock_context.args = ["manual"]
-        await command_handler.handle_mode(mock_update, mock_context)
-        print("✅ Mode command handled")
         
-        # Test pause command
-        await command_handler.handle_pause(mock_update, mock_context)
-        print("✅ Pause command handled")
-        
-        # Test resume command
-        await command_handler.handle_resume(mock_update, mock_context)
-        print("✅ Resume command handled")
-        
-        # Test stop command
-        await command_handler.handle_stop(mock_update, mock_context)
-        print("✅ Stop command handled")
+        # Dispatch all commands concurrently, as simultaneous users would, so
+        # shared bot state is exercised under interleaving
+        commands = ("status", "pnl", "mode", "pause", "resume", "stop")
+        await asyncio.gather(*(
+            getattr(command_handler, f"handle_{name}")(mock_update, mock_context)
+            for name in commands
+        ))
+        for name in commands:
+            print(f"✅ {name.title()} command handled")
         
         # Test Callback Handler
         print("\n7. 🔄 Testing Callback Handler")
@@ -348,19 +374,20 @@ async def test_telegram_service():
         print("\n9. 📋 Testing Data Structures")
         
         # Test PendingSignal
+        now = datetime.now()
         pending_signal = PendingSignal(
             signal_id="test_123",
             signal=test_signal,
             message_id=12345,
             chat_id=123456789,
-            created_at=datetime.now(),
-            expires_at=datetime.now() + timedelta(minutes=5),
+            created_at=now,
+            expires_at=now + timedelta(minutes=5),
             status=ApprovalStatus.PENDING
         )
         
         print(f"✅ PendingSignal created: {pending_signal.signal_id}")
         print(f"   Status: {pending_signal.status.value}")
-        print(f"   Expires in: {(pending_signal.expires_at - datetime.now()).seconds}s")
+        print(f"   Expires in: {(pending_signal.expires_at - now).seconds}s")
         
         # Test NotificationMessage
         notification_message = NotificationMessage(
@@ -380,7 +407,9 @@ async def test_telegram_service():
             'chat_ids': test_config.chat_ids,
             'approval_timeout': test_config.approval_timeout
         }
-        print(f"✅ TelegramConfig serialization: {len(config_dict)} fields")
+        config_json = orjson.dumps(config_dict)
+        print(f"✅ TelegramConfig serialization: {len(config_dict)} fields, {len(config_json)} bytes")
+        print(f"   Round trip: {orjson.loads(config_json) == config_dict}")
         
         # Test Error Handling
         print("\n10. ⚠️  Testing Error Handling")
@@ -412,49 +441,52 @@ async def test_telegram_service():
         rate_limited = telegram_bot._is_rate_limited()
         print(f"✅ Rate limiting check: {not rate_limited}")  # Should not be rate limited initially
         
-        # Test message formatting performance
-        start_time = datetime.now()
-        for i in range(100):
-            formatter.format_signal_alert(test_signal)
-        end_time = datetime.now()
+        # Test message formatting performance (monotonic ns counter, not wall clock)
+        # Bound methods are hoisted so the loops time the call, not the attribute lookup
+        fmt = formatter.format_signal_alert
+        t0 = time.perf_counter_ns()
+        for _ in range(100):
+            fmt(test_signal)
         
-        avg_time = (end_time - start_time).total_seconds() / 100 * 1000
+        avg_time = (time.perf_counter_ns() - t0) / 100 / 1e6
         print(f"✅ Message formatting performance: {avg_time:.2f}ms avg")
         
-        # Test approval processing performance
-        start_time = datetime.now()
-        for i in range(100):
-            await signal_notifier.process_approval(f"test_{i}", ApprovalStatus.APPROVED, "test_user")
-        end_time = datetime.now()
+        # Test concurrent approval throughput (100 button presses at once)
+        proc = signal_notifier.process_approval
+        coros = [proc(f"test_{i}", ApprovalStatus.APPROVED, "test_user") for i in range(100)]
+        t0 = time.perf_counter_ns()
+        await asyncio.gather(*coros)
+        elapsed_ms = (time.perf_counter_ns() - t0) / 1e6
         
-        avg_time = (end_time - start_time).total_seconds() / 100 * 1000
-        print(f"✅ Approval processing performance: {avg_time:.2f}ms avg")
+        throughput = 100 / (elapsed_ms / 1000) if elapsed_ms else float("inf")
+        print(f"✅ Approval processing throughput: {throughput:,.0f} approvals/sec ({elapsed_ms:.2f}ms total)")
         
         # Test Enum Values
         print("\n12. 🏷️  Testing Enums and Constants")
         
-        print(f"✅ Trading modes: {[tm.value for tm in TradingMode]}")
-        print(f"✅ Approval statuses: {[as_.value for as_ in ApprovalStatus]}")
-        print(f"✅ Notification types: {[nt.value for nt in NotificationType]}")
+        print(f"✅ Trading modes: {list(TRADING_MODE_VALUES)}")
+        print(f"✅ Approval statuses: {list(APPROVAL_STATUS_VALUES)}")
+        print(f"✅ Notification types: {list(NOTIFICATION_TYPE_VALUES)}")
         
         # Test timeout scenarios
         print("\n13. ⏱️  Testing Timeout Scenarios")
         
         # Create expired signal
+        now = datetime.now()
         expired_signal = PendingSignal(
             signal_id="expired_123",
             signal=test_signal,
             message_id=54321,
             chat_id=123456789,
-            created_at=datetime.now() - timedelta(minutes=10),
-            expires_at=datetime.now() - timedelta(minutes=5),  # Already expired
+            created_at=now - timedelta(minutes=10),
+            expires_at=now - timedelta(minutes=5),  # Already expired
             status=ApprovalStatus.PENDING
         )
         
         signal_notifier.pending_signals["expired_123"] = expired_signal
         
-        # Test cleanup
-        expired_count = signal_notifier.cleanup_expired_signals()
+        # Test cleanup with the same sampled clock
+        expired_count = signal_notifier.cleanup_expired_signals(now)
         print(f"✅ Expired signals cleaned: {expired_count}")
         
         remaining_signal = signal_notifier.pending_signals.get("expired_123")
@@ -516,15 +548,10 @@ async def test_telegram_service():
         
         return True
         
-    except ImportError as e:
-        print(f"❌ Import error: {e}")
-        print("   Make sure all dependencies are installed:")
-        print("   pip install python-telegram-bot")
-        return False
-        
     except Exception as e:
         print(f"❌ Test failed with error: {e}")
         import traceback
+        sys.stdout.flush()  # keep buffered progress lines ahead of the stderr traceback
         traceback.print_exc()
         return False
 
@@ -534,11 +561,14 @@ async def test_message_scenarios():
     print("\n🧠 Testing Message Scenarios")
     print("-" * 30)
     
+    if IMPORT_ERROR:
+        report_import_error()
+        return False
+    
     try:
-        from core.telegram_service import MessageFormatter
-        from core.earnings_scanner import EarningsGapSignal, SignalType, SignalConfidence
-        
         formatter = MessageFormatter()
+        profit_emoji = formatter.EMOJIS['profit']
+        loss_emoji = formatter.EMOJIS['loss']
         
         # Scenario 1: High confidence gap up signal
         print("1. Testing high confidence gap up message...")
@@ -612,7 +642,7 @@ async def test_message_scenarios():
             entry_price=3300.0
         )
         print(f"✅ Large profit message: {len(large_profit_message)} chars")
-        print(f"   Contains profit emoji: {formatter.EMOJIS['profit'] in large_profit_message}")
+        print(f"   Contains profit emoji: {profit_emoji in large_profit_message}")
         print(f"   Contains amount: {'2,250' in large_profit_message}")
         
         # Scenario 4: Stop loss triggered
@@ -627,22 +657,22 @@ async def test_message_scenarios():
             entry_price=1520.0
         )
         print(f"✅ Stop loss message: {len(stop_loss_message)} chars")
-        print(f"   Contains loss emoji: {formatter.EMOJIS['loss'] in stop_loss_message}")
+        print(f"   Contains loss emoji: {loss_emoji in stop_loss_message}")
         print(f"   Contains negative amount: {'-320' in stop_loss_message}")
         
         # Scenario 5: System status with multiple positions
         print("\n5. Testing complex system status...")
         
-        complex_status = {
-            'trading_mode': 'AUTO',
-            'active_trades': 5,
-            'total_pnl': 1250.75,
-            'emergency_stop': False,
-            'daily_trades': 12,
-            'success_rate': 75.0,
-            'best_performer': 'RELIANCE (+8.5%)',
-            'worst_performer': 'INFY (-2.1%)'
-        }
+        complex_status = SystemStatus(
+            mode=TradingMode.AUTO,
+            active_trades=5,
+            daily_pnl=1250.75,
+            emergency_stop=False,
+            daily_trades=12,
+            success_rate=75.0,
+            best_performer='RELIANCE (+8.5%)',
+            worst_performer='INFY (-2.1%)'
+        )
         
         complex_status_message = formatter.format_system_status(complex_status)
         print(f"✅ Complex status message: {len(complex_status_message)} chars")
@@ -682,7 +712,7 @@ async def test_message_scenarios():
             )
             print(f"✅ {scenario['status']} P&L: {len(pnl_message)} chars")
             
-            expected_emoji = formatter.EMOJIS['profit'] if scenario["pnl"] > 0 else formatter.EMOJIS['loss']
+            expected_emoji = profit_emoji if scenario["pnl"] > 0 else loss_emoji
             if scenario["pnl"] > -50 and scenario["pnl"] < 50:  # Break-even range
                 expected_emoji = formatter.EMOJIS['neutral']
             
@@ -701,21 +731,13 @@ async def test_telegram_integration():
     print("\n🔗 Testing Telegram Integration")
     print("-" * 30)
     
+    if IMPORT_ERROR:
+        report_import_error()
+        return False
+    
     try:
-        from core.telegram_service import TelegramBot, TelegramConfig, TradingMode
-        from unittest.mock import Mock, AsyncMock
-        
-        # Mock order engine and risk manager
-        mock_order_engine = Mock()
-        mock_order_engine.execute_signal = AsyncMock(return_value="TRADE_123")
-        mock_order_engine.get_execution_status = AsyncMock(return_value={
-            'active_trades': 2,
-            'total_trades': 15,
-            'emergency_stop': False,
-            'paper_trading': True
-        })
-        
-        mock_risk_manager = Mock()
+        # Shared mock order engine and risk manager
+        mock_order_engine, mock_risk_manager = dependency_mocks()
         
         # Test configuration
         config = TelegramConfig(
@@ -732,8 +754,6 @@ async def test_telegram_integration():
         bot.set_trading_mode(TradingMode.AUTO)
         
         # In auto mode, signals should be executed immediately
-        from core.earnings_scanner import EarningsGapSignal, SignalType, SignalConfidence
-        
         auto_signal = EarningsGapSignal(
             symbol="AUTO_TEST",
             company_name="Auto Test Company",
@@ -841,18 +861,25 @@ async def test_telegram_integration():
 
 
 if __name__ == "__main__":
+    # ~170 progress lines: block-buffer stdout instead of flushing each line to the
+    # terminal, and flush once per test function below
+    sys.stdout.reconfigure(line_buffering=False)
+    
     async def main():
         print("🧪 Telegram Bot Service Test Suite")
         print("=" * 60)
         
         # Run main tests
         main_test_success = await test_telegram_service()
+        sys.stdout.flush()
         
         # Run message scenario tests
         message_test_success = await test_message_scenarios()
+        sys.stdout.flush()
         
         # Run integration tests
         integration_test_success = await test_telegram_integration()
+        sys.stdout.flush()
         
         print("\n" + "=" * 60)
         if main_test_success and message_test_success and integration_test_success:
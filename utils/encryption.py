@@ -2,19 +2,51 @@
 Encryption utilities for sensitive data handling
 """
 import base64
+import hashlib
+import hmac
 import os
-from cryptography.fernet import Fernet
+from collections import OrderedDict
+from functools import lru_cache
+from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 import config
 
 
+PBKDF2_ITERATIONS = 100000
+
+# Derived keys for explicit salts, keyed by password digest so plaintext is never held
+_DERIVED_KEY_CACHE_SIZE = 32
+_derived_key_cache: "OrderedDict[Tuple[bytes, bytes, int], str]" = OrderedDict()
+
+# Fernet tokens start with version byte 0x80 and a zero-led timestamp ('gAAAAA'
+# in base64); legacy values carry that prefix base64 encoded once more
+_FERNET_TOKEN_PREFIXES = ('gAAAAA', 'Z0FBQUFB')
+_FERNET_TOKEN_MIN_LENGTH = 100
+
+# Configuration fields EncryptedConfig encrypts at rest
+_SENSITIVE_FIELDS = frozenset({
+    'kite_api_key',
+    'kite_api_secret',
+    'kite_access_token',
+    'telegram_bot_token',
+    'email_password',
+    'webhook_secret',
+})
+
+
 def generate_key() -> str:
     """Generate a new encryption key"""
     return Fernet.generate_key().decode()
 
 
+@lru_cache(maxsize=8)
+def _build_fernet(key: bytes) -> Fernet:
+    """Build (and cache) the Fernet instance for a key"""
+    return Fernet(key)
+
+
 def _get_fernet_instance(key: Optional[str] = None) -> Fernet:
     """Get Fernet instance with provided or default key"""
     if key is None:
@@ -27,7 +59,27 @@ def _get_fernet_instance(key: Optional[str] = None) -> Fernet:
     if isinstance(key, str):
         key = key.encode()
     
-    return Fernet(key)
+    return _build_fernet(key)
+
+
+def _encrypt_with(fernet: Fernet, data: Union[str, bytes]) -> str:
+    """Encrypt data with an already resolved Fernet instance"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    
+    # Fernet tokens are already URL-safe base64
+    return fernet.encrypt(data).decode('ascii')
+
+
+def _decrypt_with(fernet: Fernet, encrypted_data: str) -> str:
+    """Decrypt data with an already resolved Fernet instance"""
+    token = encrypted_data.encode('ascii')
+    
+    try:
+        return fernet.decrypt(token).decode('utf-8')
+    except InvalidToken:
+        # Legacy values were base64 encoded a second time on top of the token
+        return fernet.decrypt(base64.b64decode(token)).decode('utf-8')
 
 
 def encrypt_data(data: Union[str, bytes], key: Optional[str] = None) -> str:
@@ -39,16 +91,10 @@ def encrypt_data(data: Union[str, bytes], key: Optional[str] = None) -> str:
         key: Optional encryption key (uses config key if not provided)
         
     Returns:
-        Base64 encoded encrypted data
+        Fernet token (URL-safe base64)
     """
     try:
-        if isinstance(data, str):
-            data = data.encode('utf-8')
-        
-        fernet = _get_fernet_instance(key)
-        encrypted_data = fernet.encrypt(data)
-        
-        return base64.b64encode(encrypted_data).decode('utf-8')
+        return _encrypt_with(_get_fernet_instance(key), data)
         
     except Exception as e:
         raise ValueError(f"Encryption failed: {str(e)}")
@@ -59,23 +105,44 @@ def decrypt_data(encrypted_data: str, key: Optional[str] = None) -> str:
     Decrypt data using Fernet symmetric encryption
     
     Args:
-        encrypted_data: Base64 encoded encrypted data
+        encrypted_data: Fernet token (legacy double base64 values are accepted)
         key: Optional encryption key (uses config key if not provided)
         
     Returns:
         Decrypted data as string
     """
     try:
-        # Decode base64
-        encrypted_bytes = base64.b64decode(encrypted_data.encode('utf-8'))
+        return _decrypt_with(_get_fernet_instance(key), encrypted_data)
         
+    except Exception as e:
+        raise ValueError(f"Decryption failed: {str(e)}")
+
+
+def migrate_encrypted_data(encrypted_data: str, key: Optional[str] = None) -> str:
+    """
+    Convert a legacy double base64 encoded value to a plain Fernet token
+    
+    Args:
+        encrypted_data: Stored encrypted value (legacy or current format)
+        key: Optional encryption key (uses config key if not provided)
+        
+    Returns:
+        Fernet token, unchanged if already in the current format
+    """
+    try:
         fernet = _get_fernet_instance(key)
-        decrypted_data = fernet.decrypt(encrypted_bytes)
+        token = encrypted_data.encode('ascii')
         
-        return decrypted_data.decode('utf-8')
+        try:
+            fernet.decrypt(token)
+            return encrypted_data
+        except InvalidToken:
+            legacy_token = base64.b64decode(token)
+            fernet.decrypt(legacy_token)
+            return legacy_token.decode('ascii')
         
     except Exception as e:
-        raise ValueError(f"Decryption failed: {str(e)}")
+        raise ValueError(f"Migration failed: {str(e)}")
 
 
 def encrypt_credentials(credentials: dict, key: Optional[str] = None) -> dict:
@@ -89,15 +156,17 @@ def encrypt_credentials(credentials: dict, key: Optional[str] = None) -> dict:
     Returns:
         Dictionary with encrypted values
     """
-    encrypted_creds = {}
-    
-    for field, value in credentials.items():
-        if value and isinstance(value, str):
-            encrypted_creds[field] = encrypt_data(value, key)
-        else:
-            encrypted_creds[field] = value
-    
-    return encrypted_creds
+    try:
+        # Resolve the key once for the whole dictionary
+        fernet = _get_fernet_instance(key)
+        
+        return {
+            field: _encrypt_with(fernet, value) if value and isinstance(value, str) else value
+            for field, value in credentials.items()
+        }
+        
+    except Exception as e:
+        raise ValueError(f"Encryption failed: {str(e)}")
 
 
 def decrypt_credentials(encrypted_credentials: dict, key: Optional[str] = None) -> dict:
@@ -111,13 +180,19 @@ def decrypt_credentials(encrypted_credentials: dict, key: Optional[str] = None)
     Returns:
         Dictionary with decrypted values
     """
+    try:
+        fernet = _get_fernet_instance(key)
+    except ValueError:
+        # Without a usable key nothing can be decrypted
+        return dict(encrypted_credentials)
+    
     decrypted_creds = {}
     
     for field, value in encrypted_credentials.items():
         if value and isinstance(value, str):
             try:
-                decrypted_creds[field] = decrypt_data(value, key)
-            except ValueError:
+                decrypted_creds[field] = _decrypt_with(fernet, value)
+            except Exception:
                 # If decryption fails, assume value is not encrypted
                 decrypted_creds[field] = value
         else:
@@ -126,29 +201,52 @@ def decrypt_credentials(encrypted_credentials: dict, key: Optional[str] = None)
     return decrypted_creds
 
 
-def derive_key_from_password(password: str, salt: Optional[bytes] = None) -> tuple[str, bytes]:
+def derive_key_from_password(password: str, salt: Optional[bytes] = None,
+                             iterations: int = PBKDF2_ITERATIONS) -> tuple[str, bytes]:
     """
     Derive encryption key from password using PBKDF2
     
+    Keys derived with an explicit salt are memoized, so re-deriving the same
+    key (e.g. on config reload) skips the PBKDF2 rounds. Where memory-hardness
+    matters, cryptography's Scrypt KDF is a drop-in alternative.
+    
     Args:
         password: Password to derive key from
         salt: Optional salt (generates new if not provided)
+        iterations: PBKDF2 iteration count
         
     Returns:
         Tuple of (base64 encoded key, salt)
     """
     if salt is None:
+        # A fresh salt can never hit the cache
         salt = os.urandom(16)
+        return _pbkdf2_key(password, salt, iterations), salt
     
+    cache_key = (hashlib.sha256(password.encode()).digest(), salt, iterations)
+    key = _derived_key_cache.get(cache_key)
+    
+    if key is None:
+        key = _pbkdf2_key(password, salt, iterations)
+        _derived_key_cache[cache_key] = key
+        if len(_derived_key_cache) > _DERIVED_KEY_CACHE_SIZE:
+            _derived_key_cache.popitem(last=False)
+    else:
+        _derived_key_cache.move_to_end(cache_key)
+    
+    return key, salt
+
+
+def _pbkdf2_key(password: str, salt: bytes, iterations: int) -> str:
+    """Run PBKDF2-SHA256 and return the URL-safe base64 key"""
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
         salt=salt,
-        iterations=100000,
+        iterations=iterations,
     )
     
-    key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-    return key.decode(), salt
+    return base64.urlsafe_b64encode(kdf.derive(password.encode())).decode()
 
 
 def hash_sensitive_data(data: str) -> str:
@@ -161,32 +259,29 @@ def hash_sensitive_data(data: str) -> str:
     Returns:
         Base64 encoded hash
     """
-    digest = hashes.Hash(hashes.SHA256())
-    digest.update(data.encode('utf-8'))
-    hash_bytes = digest.finalize()
+    hash_bytes = hashlib.sha256(data.encode('utf-8')).digest()
     
-    return base64.b64encode(hash_bytes).decode('utf-8')
+    return base64.b64encode(hash_bytes).decode('ascii')
 
 
-def secure_compare(data1: str, data2: str) -> bool:
+def secure_compare(data1: Union[str, bytes], data2: Union[str, bytes]) -> bool:
     """
     Securely compare two strings (constant time)
     
     Args:
-        data1: First string
-        data2: Second string
+        data1: First string or bytes
+        data2: Second string or bytes
         
     Returns:
         True if strings match
     """
-    if len(data1) != len(data2):
-        return False
+    # compare_digest only accepts ASCII str, so text is compared as UTF-8 bytes
+    if isinstance(data1, str):
+        data1 = data1.encode('utf-8')
+    if isinstance(data2, str):
+        data2 = data2.encode('utf-8')
     
-    result = 0
-    for x, y in zip(data1, data2):
-        result |= ord(x) ^ ord(y)
-    
-    return result == 0
+    return hmac.compare_digest(data1, data2)
 
 
 class EncryptedConfig:
@@ -199,38 +294,20 @@ class EncryptedConfig:
     
     def encrypt_config(self, config_dict: dict) -> dict:
         """Encrypt sensitive fields in configuration"""
-        sensitive_fields = [
-            'kite_api_key',
-            'kite_api_secret', 
-            'kite_access_token',
-            'telegram_bot_token',
-            'email_password',
-            'webhook_secret'
-        ]
-        
-        encrypted_config = config_dict.copy()
+        encrypted_config = dict(config_dict)
         
-        for field in sensitive_fields:
-            if field in encrypted_config and encrypted_config[field]:
+        for field in _SENSITIVE_FIELDS.intersection(encrypted_config):
+            if encrypted_config[field]:
                 encrypted_config[field] = encrypt_data(encrypted_config[field], self.key)
         
         return encrypted_config
     
     def decrypt_config(self, encrypted_config: dict) -> dict:
         """Decrypt sensitive fields in configuration"""
-        sensitive_fields = [
-            'kite_api_key',
-            'kite_api_secret',
-            'kite_access_token', 
-            'telegram_bot_token',
-            'email_password',
-            'webhook_secret'
-        ]
+        decrypted_config = dict(encrypted_config)
         
-        decrypted_config = encrypted_config.copy()
-        
-        for field in sensitive_fields:
-            if field in decrypted_config and decrypted_config[field]:
+        for field in _SENSITIVE_FIELDS.intersection(decrypted_config):
+            if decrypted_config[field]:
                 try:
                     decrypted_config[field] = decrypt_data(decrypted_config[field], self.key)
                 except ValueError:
@@ -239,14 +316,23 @@ class EncryptedConfig:
         
         return decrypted_config
     
-    def is_encrypted(self, data: str) -> bool:
-        """Check if data appears to be encrypted"""
+    def is_encrypted(self, data: str, strict: bool = False) -> bool:
+        """
+        Check if data appears to be encrypted
+        
+        The default check only looks at the token shape; pass strict=True to
+        verify the value actually decrypts with this config's key.
+        """
+        if not isinstance(data, str):
+            return False
+        
+        if not strict:
+            return len(data) >= _FERNET_TOKEN_MIN_LENGTH and data.startswith(_FERNET_TOKEN_PREFIXES)
+        
         try:
-            base64.b64decode(data)
-            # Try to decrypt
             decrypt_data(data, self.key)
             return True
-        except Exception:
+        except ValueError:
             return False
 
 
@@ -277,4 +363,4 @@ def mask_sensitive_data(data: str, show_chars: int = 4) -> str:
     if not data or len(data) <= show_chars * 2:
         return '*' * len(data) if data else ''
     
-    return f"{data[:show_chars]}{'*' * (len(data) - show_chars * 2)}{data[-show_chars:]}"
\ No newline at end of file
+    return f"{data[:show_chars]}{'*' * (len(data) - show_chars * 2)}{data[-show_chars:]}"
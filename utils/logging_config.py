@@ -1,10 +1,16 @@
 """
 Logging configuration for Earnings Gap Trader
 """
+import asyncio
+import atexit
+import functools
 import logging
 import logging.handlers
+import queue
 import sys
 import os
+import time
+from contextvars import ContextVar
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -12,6 +18,34 @@ import structlog
 import config
 
 
+# Fields added by the active LogContext scopes (replaced, never mutated)
+_log_context: ContextVar[dict] = ContextVar('log_context', default={})
+
+# Directory for the auxiliary trade/performance logs (next to the main log file)
+_LOG_DIR = Path(config.LOG_FILE).parent if config.LOG_FILE else None
+
+# One-time configuration guards (setup_logging may run repeatedly, e.g. in tests)
+_STRUCTLOG_CONFIGURED = False
+_THIRD_PARTY_CONFIGURED = False
+
+# Background listener that owns the rotating file handler
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_queue_listener() -> None:
+    """Stop the file logging listener, flushing any queued records"""
+    global _queue_listener
+    
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
 def setup_logging(
     log_level: Optional[str] = None,
     log_file: Optional[str] = None,
@@ -34,15 +68,13 @@ def setup_logging(
         log_dir = Path(log_file).parent
         log_dir.mkdir(exist_ok=True)
     
-    # Configure Python standard logging
-    logging.basicConfig(
-        level=getattr(logging, log_level.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[]
-    )
-    
-    # Remove default handlers
-    logging.getLogger().handlers.clear()
+    # Configure the root logger, closing handlers left by a previous setup
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+    _stop_queue_listener()
+    root_logger.setLevel(getattr(logging, log_level.upper()))
     
     # Create formatters
     console_formatter = ColoredFormatter(
@@ -59,6 +91,7 @@ def setup_logging(
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(console_formatter)
     console_handler.setLevel(getattr(logging, log_level.upper()))
+    console_handler.addFilter(_context_filter)
     
     # File handler with rotation
     if log_file:
@@ -71,11 +104,15 @@ def setup_logging(
         file_handler.setFormatter(file_formatter)
         file_handler.setLevel(logging.DEBUG)
         
-        # Add handlers to root logger
-        logging.getLogger().addHandler(file_handler)
+        # Callers only enqueue; disk writes and rotation happen on the listener thread
+        log_queue = queue.Queue(-1)
+        _start_queue_listener(log_queue, file_handler)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(_context_filter)
+        root_logger.addHandler(queue_handler)
     
     # Add console handler
-    logging.getLogger().addHandler(console_handler)
+    root_logger.addHandler(console_handler)
     
     # Configure structured logging if enabled
     if enable_structured_logging:
@@ -86,11 +123,25 @@ def setup_logging(
     
     # Log startup message
     logger = get_logger(__name__)
-    logger.info(f"Logging initialized - Level: {log_level}, File: {log_file or 'None'}")
+    logger.info("Logging initialized - Level: %s, File: %s", log_level, log_file or 'None')
+
+
+def _start_queue_listener(log_queue: queue.Queue, handler: logging.Handler) -> None:
+    """Start the background listener writing queued records to handler"""
+    global _queue_listener
+    
+    _queue_listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _queue_listener.start()
 
 
 def setup_structured_logging() -> None:
     """Set up structured logging with structlog"""
+    global _STRUCTLOG_CONFIGURED
+    
+    # Reconfiguring would rebuild the processor chain and drop cached loggers
+    if _STRUCTLOG_CONFIGURED:
+        return
+    
     try:
         structlog.configure(
             processors=[
@@ -109,6 +160,7 @@ def setup_structured_logging() -> None:
             wrapper_class=structlog.stdlib.BoundLogger,
             cache_logger_on_first_use=True,
         )
+        _STRUCTLOG_CONFIGURED = True
     except ImportError:
         # structlog not available, skip structured logging
         pass
@@ -116,6 +168,12 @@ def setup_structured_logging() -> None:
 
 def configure_third_party_loggers() -> None:
     """Configure log levels for third-party libraries"""
+    global _THIRD_PARTY_CONFIGURED
+    
+    if _THIRD_PARTY_CONFIGURED:
+        return
+    _THIRD_PARTY_CONFIGURED = True
+    
     # Reduce verbosity of third-party libraries
     logging.getLogger('urllib3').setLevel(logging.WARNING)
     logging.getLogger('requests').setLevel(logging.WARNING)
@@ -149,15 +207,55 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'      # Reset
     }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        reset = self.COLORS['RESET']
+        self._colored_levels = {
+            level: f"{color}{level}{reset}"
+            for level, color in self.COLORS.items()
+            if level != 'RESET'
+        }
+        # Escape codes are only useful on a terminal (not CI or piped output)
+        self._enabled = sys.stdout.isatty()
+    
     def format(self, record):
-        # Add color to levelname
-        if record.levelname in self.COLORS:
-            record.levelname = (
-                f"{self.COLORS[record.levelname]}{record.levelname}"
-                f"{self.COLORS['RESET']}"
-            )
+        if not self._enabled:
+            return super().format(record)
         
-        return super().format(record)
+        # Color the levelname for this handler only; the record is shared
+        levelname = record.levelname
+        record.levelname = self._colored_levels.get(levelname, levelname)
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
+
+
+TRADE_LOG_FILE = "trades.log"
+
+
+@functools.lru_cache(maxsize=1)
+def _get_trade_handler() -> Optional[logging.Handler]:
+    """Create the rotating trades.log handler once per process"""
+    if _LOG_DIR is None:
+        return None
+    
+    trade_handler = logging.handlers.RotatingFileHandler(
+        _LOG_DIR / TRADE_LOG_FILE,
+        maxBytes=5 * 1024 * 1024,  # 5MB
+        backupCount=10,
+        encoding='utf-8'
+    )
+    
+    trade_formatter = logging.Formatter(
+        '%(asctime)s - TRADE - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    trade_handler.setFormatter(trade_formatter)
+    trade_handler.setLevel(logging.INFO)
+    trade_handler.addFilter(_context_filter)
+    
+    return trade_handler
 
 
 class TradingLogger:
@@ -165,60 +263,45 @@ class TradingLogger:
     
     def __init__(self, name: str):
         self.logger = get_logger(name)
-        self.trade_file = "trades.log"
+        self.trade_file = TRADE_LOG_FILE
         
-        # Create separate handler for trade-specific logs
-        if config.LOG_FILE:
-            trade_log_path = Path(config.LOG_FILE).parent / self.trade_file
-            self.trade_handler = logging.handlers.RotatingFileHandler(
-                trade_log_path,
-                maxBytes=5 * 1024 * 1024,  # 5MB
-                backupCount=10,
-                encoding='utf-8'
-            )
-            
-            trade_formatter = logging.Formatter(
-                '%(asctime)s - TRADE - %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            self.trade_handler.setFormatter(trade_formatter)
-            self.trade_handler.setLevel(logging.INFO)
+        # Separate handler for trade-specific logs, shared by every TradingLogger
+        trade_handler = _get_trade_handler()
+        if trade_handler is not None:
+            self.trade_handler = trade_handler
+            self.trade_logger = logging.getLogger('trades')
+            if trade_handler not in self.trade_logger.handlers:
+                self.trade_logger.addHandler(trade_handler)
+            # self.logger already sends the same message to the application log
+            self.trade_logger.propagate = False
     
     def log_trade_entry(self, symbol: str, quantity: int, price: float, strategy: str) -> None:
         """Log trade entry"""
-        message = f"ENTRY - {symbol} - Qty: {quantity} - Price: ₹{price:.2f} - Strategy: {strategy}"
-        self.logger.info(message)
+        message = "ENTRY - %s - Qty: %s - Price: ₹%.2f - Strategy: %s"
+        self.logger.info(message, symbol, quantity, price, strategy)
         
         if hasattr(self, 'trade_handler'):
-            trade_logger = logging.getLogger('trades')
-            trade_logger.addHandler(self.trade_handler)
-            trade_logger.info(message)
+            self.trade_logger.info(message, symbol, quantity, price, strategy)
     
     def log_trade_exit(self, symbol: str, quantity: int, entry_price: float, exit_price: float, pnl: float) -> None:
         """Log trade exit"""
-        message = (f"EXIT - {symbol} - Qty: {quantity} - Entry: ₹{entry_price:.2f} - "
-                  f"Exit: ₹{exit_price:.2f} - P&L: ₹{pnl:.2f}")
-        self.logger.info(message)
+        message = "EXIT - %s - Qty: %s - Entry: ₹%.2f - Exit: ₹%.2f - P&L: ₹%.2f"
+        self.logger.info(message, symbol, quantity, entry_price, exit_price, pnl)
         
         if hasattr(self, 'trade_handler'):
-            trade_logger = logging.getLogger('trades')
-            trade_logger.addHandler(self.trade_handler)
-            trade_logger.info(message)
+            self.trade_logger.info(message, symbol, quantity, entry_price, exit_price, pnl)
     
     def log_gap_detection(self, symbol: str, gap_percent: float, price: float) -> None:
         """Log gap detection"""
-        message = f"GAP_DETECTED - {symbol} - Gap: {gap_percent:+.2f}% - Price: ₹{price:.2f}"
-        self.logger.info(message)
+        self.logger.info("GAP_DETECTED - %s - Gap: %+.2f%% - Price: ₹%.2f", symbol, gap_percent, price)
     
     def log_risk_alert(self, alert_type: str, message: str) -> None:
         """Log risk management alerts"""
-        log_message = f"RISK_ALERT - {alert_type} - {message}"
-        self.logger.warning(log_message)
+        self.logger.warning("RISK_ALERT - %s - %s", alert_type, message)
     
     def log_system_event(self, event_type: str, details: str) -> None:
         """Log system events"""
-        message = f"SYSTEM - {event_type} - {details}"
-        self.logger.info(message)
+        self.logger.info("SYSTEM - %s - %s", event_type, details)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -247,28 +330,33 @@ def get_trading_logger(name: str) -> TradingLogger:
     return TradingLogger(name)
 
 
+class ContextFilter(logging.Filter):
+    """Handler filter that copies the active LogContext fields onto records"""
+    
+    def filter(self, record):
+        for key, value in _log_context.get().items():
+            setattr(record, key, value)
+        return True
+
+
+# Shared by every handler this module creates (root, trade and performance)
+_context_filter = ContextFilter()
+
+
 class LogContext:
-    """Context manager for adding context to logs"""
+    """Context manager for adding context to logs (thread and task local)"""
     
     def __init__(self, logger: logging.Logger, **context):
         self.logger = logger
         self.context = context
-        self.old_factory = None
+        self._token = None
     
     def __enter__(self):
-        self.old_factory = logging.getLogRecordFactory()
-        
-        def record_factory(*args, **kwargs):
-            record = self.old_factory(*args, **kwargs)
-            for key, value in self.context.items():
-                setattr(record, key, value)
-            return record
-        
-        logging.setLogRecordFactory(record_factory)
+        self._token = _log_context.set({**_log_context.get(), **self.context})
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        logging.setLogRecordFactory(self.old_factory)
+        _log_context.reset(self._token)
 
 
 def log_with_context(logger: logging.Logger, **context):
@@ -281,6 +369,14 @@ def log_with_context(logger: logging.Logger, **context):
             logger.info("This will include trade_id and symbol in the log")
     """
     def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with LogContext(logger, **context):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+        
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
             with LogContext(logger, **context):
                 return func(*args, **kwargs)
@@ -292,8 +388,8 @@ def setup_performance_logging() -> None:
     """Set up performance monitoring logs"""
     perf_logger = get_logger('performance')
     
-    if config.LOG_FILE:
-        perf_log_path = Path(config.LOG_FILE).parent / "performance.log"
+    if _LOG_DIR is not None:
+        perf_log_path = _LOG_DIR / "performance.log"
         perf_handler = logging.handlers.RotatingFileHandler(
             perf_log_path,
             maxBytes=5 * 1024 * 1024,  # 5MB
@@ -306,62 +402,41 @@ def setup_performance_logging() -> None:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         perf_handler.setFormatter(perf_formatter)
+        perf_handler.addFilter(_context_filter)
         perf_logger.addHandler(perf_handler)
         perf_logger.setLevel(logging.INFO)
 
 
 def log_execution_time(func):
-    """Decorator to log function execution time"""
+    """Decorator to log function (or coroutine) execution time"""
+    # Resolved once at decoration time to keep the timed path minimal
+    perf_counter_ns = time.perf_counter_ns
+    logger = get_logger('performance')
+    
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start_ns = perf_counter_ns()
+            result = await func(*args, **kwargs)
+            elapsed_ns = perf_counter_ns() - start_ns
+            
+            logger.info("%s executed in %.3f ms", func.__name__, elapsed_ns / 1e6)
+            
+            return result
+        return async_wrapper
+    
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        import time
-        start_time = time.time()
+        start_ns = perf_counter_ns()
         result = func(*args, **kwargs)
-        execution_time = time.time() - start_time
+        elapsed_ns = perf_counter_ns() - start_ns
         
-        logger = get_logger('performance')
-        logger.info(f"{func.__name__} executed in {execution_time:.4f} seconds")
+        logger.info("%s executed in %.3f ms", func.__name__, elapsed_ns / 1e6)
         
         return result
     return wrapper
 
 
-class AsyncLogHandler(logging.handlers.RotatingFileHandler):
-    """Asynchronous log handler to avoid blocking the main thread"""
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.queue = None
-        try:
-            import asyncio
-            import queue
-            self.queue = queue.Queue(maxsize=1000)
-            self.loop = asyncio.new_event_loop()
-        except ImportError:
-            pass
-    
-    def emit(self, record):
-        if self.queue:
-            try:
-                self.queue.put_nowait(record)
-            except:
-                # Queue is full, drop the log
-                pass
-        else:
-            super().emit(record)
-    
-    async def flush_logs(self):
-        """Flush queued logs asynchronously"""
-        if not self.queue:
-            return
-        
-        while not self.queue.empty():
-            try:
-                record = self.queue.get_nowait()
-                super().emit(record)
-            except:
-                break
-
-
 # Export commonly used functions
 __all__ = [
     'setup_logging',
@@ -369,6 +444,7 @@ __all__ = [
     'get_trading_logger',
     'TradingLogger',
     'LogContext',
+    'ContextFilter',
     'log_with_context',
     'log_execution_time',
     'setup_performance_logging'
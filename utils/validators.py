@@ -1,16 +1,63 @@
 """
 Data validation utilities for trading system
 """
+import math
 import re
-from typing import Union, Optional, List
+import string
+from functools import lru_cache
+from typing import Dict, Iterable, Union, Optional, List
 from datetime import datetime, time
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 
 
+# Patterns compiled once at import rather than looked up in re's cache per call
+# Common NSE symbol shapes in one alternation: standard symbols like RELIANCE, TCS;
+# symbols with numbers; symbols with & like M&MFIN
+_SYMBOL_VALID_RE = re.compile(r'[A-Z]{2,10}|[A-Z]+\d+|[A-Z]+&[A-Z]+')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_STRIP_RE = re.compile(r'[\s\-\(\)]')
+_PHONE_RES = (
+    re.compile(r'^\+91[6-9]\d{9}$'),  # +91 followed by 10 digits starting with 6-9
+    re.compile(r'^91[6-9]\d{9}$'),    # 91 followed by 10 digits starting with 6-9
+    re.compile(r'^[6-9]\d{9}$')       # 10 digits starting with 6-9
+)
+_TIME_RE = re.compile(r'^([01]?\d|2[0-3]):([0-5]?\d)$')
+_WS_RE = re.compile(r'\s+')
+
+# str.translate table deleting C0/C1 control characters
+_CTRL_TABLE = dict.fromkeys([*range(0x00, 0x20), *range(0x7f, 0xa0)])
+
+_PRICE_MAX = 100000
+_PRICE_MAX_DECIMAL = Decimal(_PRICE_MAX)
+
+_MISSING = object()
+_REQUIRED_CONFIG_FIELDS = (
+    'max_position_size',
+    'risk_per_trade',
+    'stop_loss_percentage',
+    'target_percentage',
+    'max_daily_loss',
+    'max_open_positions'
+)
+
+_VALID_ORDER_TYPES = ('MARKET', 'LIMIT', 'SL', 'SL-M')
+_VALID_TRANSACTION_TYPES = ('BUY', 'SELL')
+_ORDER_TYPE_ERROR = f"Order type must be one of: {', '.join(_VALID_ORDER_TYPES)}"
+_TRANSACTION_TYPE_ERROR = f"Transaction type must be one of: {', '.join(_VALID_TRANSACTION_TYPES)}"
+
+# Simple character classes are checked with set operations instead of the regex engine
+_SYMBOL_CHARS = frozenset(string.ascii_uppercase + string.digits + '&-')
+_API_KEY_CHARS = frozenset(string.ascii_letters + string.digits + '_-.')
+
+
+@lru_cache(maxsize=4096)
 def validate_symbol(symbol: str) -> tuple[bool, str]:
     """
     Validate stock symbol format
     
+    Results are memoized per symbol string; use validate_symbol.cache_clear()
+    to reset (e.g. in tests).
+    
     Args:
         symbol: Stock symbol to validate
         
@@ -27,21 +74,30 @@ def validate_symbol(symbol: str) -> tuple[bool, str]:
     if len(clean_symbol) < 1 or len(clean_symbol) > 10:
         return False, "Symbol must be 1-10 characters long"
     
-    # Check format (alphanumeric, possibly with & or -)
-    if not re.match(r'^[A-Z0-9&-]+$', clean_symbol):
-        return False, "Symbol must contain only uppercase letters, numbers, & or -"
+    # Check for common NSE symbols patterns; a match implies the character set is valid
+    if _SYMBOL_VALID_RE.fullmatch(clean_symbol):
+        return True, ""
     
-    # Check for common NSE symbols patterns
-    valid_patterns = [
-        r'^[A-Z]{2,10}$',  # Standard symbols like RELIANCE, TCS
-        r'^[A-Z]+\d+$',    # Symbols with numbers like M&M
-        r'^[A-Z]+&[A-Z]+$' # Symbols with & like M&MFIN
-    ]
+    # Check format (alphanumeric, possibly with & or -) to report the right error
+    if not _SYMBOL_CHARS.issuperset(clean_symbol):
+        return False, "Symbol must contain only uppercase letters, numbers, & or -"
     
-    if not any(re.match(pattern, clean_symbol) for pattern in valid_patterns):
-        return False, "Invalid symbol format"
+    return False, "Invalid symbol format"
+
+
+def validate_symbols(symbols: Iterable[str]) -> Dict[str, tuple[bool, str]]:
+    """
+    Validate a batch of stock symbols (e.g. index constituents or an option chain)
     
-    return True, ""
+    Args:
+        symbols: Stock symbols to validate
+        
+    Returns:
+        Dictionary mapping each distinct symbol, in first-seen order, to
+        (is_valid, error_message)
+    """
+    # Duplicates are validated once; repeats across batches hit validate_symbol's cache
+    return {symbol: validate_symbol(symbol) for symbol in dict.fromkeys(symbols)}
 
 
 def validate_price(price: Union[float, str, Decimal]) -> tuple[bool, str]:
@@ -54,15 +110,33 @@ def validate_price(price: Union[float, str, Decimal]) -> tuple[bool, str]:
     Returns:
         Tuple of (is_valid, error_message)
     """
+    # Numeric inputs are checked directly; only str/Decimal go through Decimal parsing
+    if isinstance(price, float) or (isinstance(price, int) and not isinstance(price, bool)):
+        if math.isnan(price):
+            return False, "Price must be a valid number"
+        
+        if price <= 0:
+            return False, "Price must be positive"
+        
+        if price > _PRICE_MAX:
+            return False, "Price cannot exceed ₹100,000"
+        
+        # A float has at most 2 decimal places exactly when it is its own 2-place rounding
+        if round(price, 2) != price:
+            return False, "Price cannot have more than 2 decimal places"
+        
+        return True, ""
+    
     try:
         price_decimal = Decimal(str(price))
-    except (ValueError, TypeError):
+        is_positive = price_decimal > 0
+    except (ValueError, TypeError, InvalidOperation):
         return False, "Price must be a valid number"
     
-    if price_decimal <= 0:
+    if not is_positive:
         return False, "Price must be positive"
     
-    if price_decimal > Decimal('100000'):
+    if price_decimal > _PRICE_MAX_DECIMAL:
         return False, "Price cannot exceed ₹100,000"
     
     # Check decimal places (NSE allows up to 2 decimal places)
@@ -122,6 +196,7 @@ def validate_percentage(percentage: Union[float, str, Decimal], min_val: float =
     return True, ""
 
 
+@lru_cache(maxsize=4096)
 def validate_email(email: str) -> tuple[bool, str]:
     """
     Validate email address format
@@ -135,17 +210,18 @@ def validate_email(email: str) -> tuple[bool, str]:
     if not email:
         return False, "Email cannot be empty"
     
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    if not re.match(email_pattern, email):
-        return False, "Invalid email format"
-    
+    # Length checks first so oversized input never reaches the regex
     if len(email) > 254:
         return False, "Email address too long"
     
+    # Shortest address the pattern can accept is like a@b.co
+    if len(email) < 6 or not _EMAIL_RE.match(email):
+        return False, "Invalid email format"
+    
     return True, ""
 
 
+@lru_cache(maxsize=4096)
 def validate_phone_number(phone: str) -> tuple[bool, str]:
     """
     Validate phone number format (Indian format)
@@ -160,21 +236,16 @@ def validate_phone_number(phone: str) -> tuple[bool, str]:
         return False, "Phone number cannot be empty"
     
     # Remove spaces, dashes, and brackets
-    clean_phone = re.sub(r'[\s\-\(\)]', '', phone)
+    clean_phone = _PHONE_STRIP_RE.sub('', phone)
     
-    # Check for Indian phone number patterns
-    indian_patterns = [
-        r'^\+91[6-9]\d{9}$',  # +91 followed by 10 digits starting with 6-9
-        r'^91[6-9]\d{9}$',    # 91 followed by 10 digits starting with 6-9
-        r'^[6-9]\d{9}$'       # 10 digits starting with 6-9
-    ]
-    
-    if not any(re.match(pattern, clean_phone) for pattern in indian_patterns):
+    # Check for Indian phone number patterns (at most +91 and 10 digits)
+    if len(clean_phone) > 13 or not any(pattern.match(clean_phone) for pattern in _PHONE_RES):
         return False, "Invalid Indian phone number format"
     
     return True, ""
 
 
+@lru_cache(maxsize=4096)
 def validate_telegram_chat_id(chat_id: str) -> tuple[bool, str]:
     """
     Validate Telegram chat ID format
@@ -190,7 +261,8 @@ def validate_telegram_chat_id(chat_id: str) -> tuple[bool, str]:
     
     # Telegram chat IDs are typically negative integers for groups/channels
     # or positive integers for users
-    if not re.match(r'^-?\d+$', chat_id):
+    digits = chat_id[1:] if chat_id.startswith('-') else chat_id
+    if not digits.isdecimal():
         return False, "Invalid Telegram chat ID format"
     
     chat_id_int = int(chat_id)
@@ -223,7 +295,7 @@ def validate_api_key(api_key: str, min_length: int = 16) -> tuple[bool, str]:
         return False, "API key too long"
     
     # Check for reasonable characters (alphanumeric and common special chars)
-    if not re.match(r'^[a-zA-Z0-9_\-\.]+$', api_key):
+    if not _API_KEY_CHARS.issuperset(api_key):
         return False, "API key contains invalid characters"
     
     return True, ""
@@ -240,12 +312,10 @@ def validate_time_range(start_time: str, end_time: str) -> tuple[bool, str]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    time_pattern = r'^([01]?\d|2[0-3]):([0-5]?\d)$'
-    
-    if not re.match(time_pattern, start_time):
+    if not _TIME_RE.match(start_time):
         return False, "Invalid start time format (use HH:MM)"
     
-    if not re.match(time_pattern, end_time):
+    if not _TIME_RE.match(end_time):
         return False, "Invalid end time format (use HH:MM)"
     
     try:
@@ -271,53 +341,50 @@ def validate_trading_config(config: dict) -> tuple[bool, List[str]]:
     Returns:
         Tuple of (is_valid, list_of_errors)
     """
-    errors = []
+    # One lookup per field; _MISSING distinguishes absent keys from explicit None values
+    max_position_size = config.get('max_position_size', _MISSING)
+    risk_per_trade = config.get('risk_per_trade', _MISSING)
+    stop_loss_percentage = config.get('stop_loss_percentage', _MISSING)
+    target_percentage = config.get('target_percentage', _MISSING)
+    max_daily_loss = config.get('max_daily_loss', _MISSING)
+    max_open_positions = config.get('max_open_positions', _MISSING)
     
     # Validate required fields
-    required_fields = [
-        'max_position_size',
-        'risk_per_trade', 
-        'stop_loss_percentage',
-        'target_percentage',
-        'max_daily_loss',
-        'max_open_positions'
+    errors = [
+        f"Missing required field: {field}"
+        for field, value in zip(_REQUIRED_CONFIG_FIELDS, (
+            max_position_size, risk_per_trade, stop_loss_percentage,
+            target_percentage, max_daily_loss, max_open_positions
+        ))
+        if value is _MISSING
     ]
     
-    for field in required_fields:
-        if field not in config:
-            errors.append(f"Missing required field: {field}")
-    
     # Validate numeric fields
-    if 'max_position_size' in config:
-        if not isinstance(config['max_position_size'], (int, float)) or config['max_position_size'] <= 0:
+    if max_position_size is not _MISSING:
+        if not isinstance(max_position_size, (int, float)) or max_position_size <= 0:
             errors.append("Max position size must be a positive number")
     
-    if 'risk_per_trade' in config:
-        is_valid, error = validate_percentage(config['risk_per_trade'] * 100, 0.1, 10)
-        if not is_valid:
-            errors.append(f"Risk per trade: {error}")
-    
-    if 'stop_loss_percentage' in config:
-        is_valid, error = validate_percentage(config['stop_loss_percentage'] * 100, 0.5, 20)
-        if not is_valid:
-            errors.append(f"Stop loss percentage: {error}")
-    
-    if 'target_percentage' in config:
-        is_valid, error = validate_percentage(config['target_percentage'] * 100, 1, 50)
-        if not is_valid:
-            errors.append(f"Target percentage: {error}")
-    
-    if 'max_daily_loss' in config:
-        if not isinstance(config['max_daily_loss'], (int, float)) or config['max_daily_loss'] <= 0:
+    for label, value, min_val, max_val in (
+        ("Risk per trade", risk_per_trade, 0.1, 10),
+        ("Stop loss percentage", stop_loss_percentage, 0.5, 20),
+        ("Target percentage", target_percentage, 1, 50),
+    ):
+        if value is not _MISSING:
+            is_valid, error = validate_percentage(value * 100, min_val, max_val)
+            if not is_valid:
+                errors.append(f"{label}: {error}")
+    
+    if max_daily_loss is not _MISSING:
+        if not isinstance(max_daily_loss, (int, float)) or max_daily_loss <= 0:
             errors.append("Max daily loss must be a positive number")
     
-    if 'max_open_positions' in config:
-        if not isinstance(config['max_open_positions'], int) or config['max_open_positions'] <= 0:
+    if max_open_positions is not _MISSING:
+        if not isinstance(max_open_positions, int) or max_open_positions <= 0:
             errors.append("Max open positions must be a positive integer")
     
     # Validate logical relationships
-    if 'stop_loss_percentage' in config and 'target_percentage' in config:
-        if config['target_percentage'] <= config['stop_loss_percentage']:
+    if stop_loss_percentage is not _MISSING and target_percentage is not _MISSING:
+        if target_percentage <= stop_loss_percentage:
             errors.append("Target percentage should be greater than stop loss percentage")
     
     return len(errors) == 0, errors
@@ -358,16 +425,14 @@ def validate_order_params(order_params: dict) -> tuple[bool, List[str]]:
             errors.append(f"Price: {error}")
     
     # Validate order type
-    valid_order_types = ['MARKET', 'LIMIT', 'SL', 'SL-M']
     if 'order_type' in order_params:
-        if order_params['order_type'] not in valid_order_types:
-            errors.append(f"Order type must be one of: {', '.join(valid_order_types)}")
+        if order_params['order_type'] not in _VALID_ORDER_TYPES:
+            errors.append(_ORDER_TYPE_ERROR)
     
     # Validate transaction type
-    valid_transaction_types = ['BUY', 'SELL']
     if 'transaction_type' in order_params:
-        if order_params['transaction_type'] not in valid_transaction_types:
-            errors.append(f"Transaction type must be one of: {', '.join(valid_transaction_types)}")
+        if order_params['transaction_type'] not in _VALID_TRANSACTION_TYPES:
+            errors.append(_TRANSACTION_TYPE_ERROR)
     
     return len(errors) == 0, errors
 
@@ -387,8 +452,11 @@ def sanitize_input(input_str: str, max_length: int = 255) -> str:
         return ""
     
     # Remove control characters and excessive whitespace
-    sanitized = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', input_str)
-    sanitized = re.sub(r'\s+', ' ', sanitized)
+    if input_str.isprintable():
+        # No control characters, and plain spaces are the only whitespace
+        sanitized = _WS_RE.sub(' ', input_str) if '  ' in input_str else input_str
+    else:
+        sanitized = _WS_RE.sub(' ', input_str.translate(_CTRL_TABLE))
     sanitized = sanitized.strip()
     
     # Truncate if too long